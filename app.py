@@ -1,11 +1,22 @@
-from flask import Flask, render_template, request, send_file, session, jsonify
-from generate_chart import generate_chart_buffer
+from flask import Flask, Response, render_template, request, send_file, jsonify, url_for, stream_with_context
+from generate_chart import generate_chart_buffer, get_render_cache_stats
+from artifact_store import ArtifactStore, artifact_key, MIMETYPES
 import base64
 import io
+import json
+import multiprocessing
 import os
 import sys
+import threading
+import time
 import yfinance as yf
 from contextlib import contextmanager
+from datetime import datetime
+from singleflight import SingleFlight
+import render_pool
+from render_pool import RenderPoolBusy
+from jobs import JobQueue, QueueFull, RetryLater
+from quote_stream import QuoteHub
 
 @contextmanager
 def suppress_stdout_stderr():
@@ -31,10 +42,115 @@ def suppress_stdout_stderr():
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-in-production'
 
+# Rendered charts live server-side; clients get an artifact id instead of a cookie payload.
+# Artifacts are written through to a shared directory so any server worker can serve the download.
+artifact_store = ArtifactStore(
+    max_bytes=int(os.getenv('ARTIFACT_STORE_MB', '64')) * 1024 * 1024,
+    shared_dir=os.getenv('ARTIFACT_DIR', os.path.join('data_cache', 'artifacts')) or None,
+    shared_max_bytes=int(os.getenv('ARTIFACT_DIR_MB', '256')) * 1024 * 1024
+)
+quote_flight = SingleFlight()
+quote_hub = QuoteHub()
+QUOTE_STREAM_MAX_TICKERS = 50
+# Each open stream holds a server thread; keep enough threads free for ordinary requests
+QUOTE_STREAM_MAX_CLIENTS = int(os.getenv('QUOTE_STREAM_MAX_CLIENTS', '8'))
+_quote_stream_slots = threading.BoundedSemaphore(QUOTE_STREAM_MAX_CLIENTS)
+
+# Spawned render workers re-import this module; only the server process starts background work
+if multiprocessing.parent_process() is None:
+    # Keep frequently viewed economic indicators warm in the background
+    from economic_data import start_refresh_scheduler
+    start_refresh_scheduler()
+
+    # Pre-warmed render workers (enabled with RENDER_WORKERS=<n>)
+    render_pool.start()
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+def _parse_chart_form(form):
+    """Translate the chart form into generate_chart_buffer keyword arguments"""
+    period = form.get('period')
+    interval = form.get('interval')
+    resolution = form.get('resolution')
+    style = form.get('style')
+    title = form.get('title')
+    chart_type = form.get('chart_type', 'line')
+    
+    # Optional start/end dates
+    start = form.get('start')
+    end = form.get('end')
+    if not start: start = None
+    if not end: end = None
+    
+    # Optional comparison
+    compare_ticker = form.get('compare_ticker')
+    if compare_ticker:
+        if ',' in compare_ticker:
+            compare_ticker = [t.strip() for t in compare_ticker.split(',')]
+        else:
+            compare_ticker = compare_ticker.strip()
+    else:
+        compare_ticker = None
+
+    # Customization
+    primary_color = form.get('primary_color')
+    primary_type = form.get('primary_type', 'line')
+    compare_color = form.get('compare_color')
+    compare_type = form.get('compare_type', 'line')
+    bg_color = form.get('bg_color', 'transparent')
+    
+    # Advanced Customization
+    try:
+        grid_opacity = float(form.get('grid_opacity', 10.0)) / 100.0
+    except ValueError:
+        grid_opacity = 0.1
+    
+    # Per-Asset Settings (new feature)
+    per_asset_settings = None
+    per_asset_settings_json = form.get('per_asset_settings')
+    if per_asset_settings_json:
+        try:
+            per_asset_settings = json.loads(per_asset_settings_json)
+            print(f"Per-asset settings: {per_asset_settings}")
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error parsing per-asset settings: {e}")
+            per_asset_settings = None
+    
+    # Output Format (PNG or SVG)
+    output_format = form.get('output_format', 'png').lower()
+    if output_format not in ['png', 'svg']:
+        output_format = 'png'
+    print(f"Output format: {output_format}")
+
+    # Prefer 'primary_type' (new UI) and fall back to the legacy 'chart_type' toggle
+    final_primary_type = primary_type if primary_type else chart_type
+
+    return dict(
+        period=period, interval=interval, start=start, end=end,
+        resolution=resolution, style=style, title=title,
+        chart_type=final_primary_type,
+        compare_ticker=compare_ticker,
+        primary_color=primary_color,
+        compare_color=compare_color,
+        compare_type=compare_type,
+        bg_color=bg_color,
+        grid_opacity=grid_opacity,
+        per_asset_settings=per_asset_settings,
+        output_format=output_format
+    )
+
+def _render_artifact(ticker, chart_kwargs, progress=None):
+    """Render a chart into the artifact store; returns (artifact_id, bytes)"""
+    artifact_id = artifact_key({'ticker': ticker, **chart_kwargs})
+    # Reuse is left to the render cache, which honours per-interval TTLs and never keeps notice images
+    # with suppress_stdout_stderr():
+    buf = generate_chart_buffer(ticker, progress=progress, **chart_kwargs)
+    img_bytes = buf.getvalue()
+    artifact_store.put(artifact_id, img_bytes, ticker=ticker, format=chart_kwargs['output_format'], created=time.time())
+    return artifact_id, img_bytes
+
 @app.route('/generate', methods=['POST'])
 def generate_chart():
     try:
@@ -47,104 +163,134 @@ def generate_chart():
             print("Error: Ticker is missing")
             return jsonify({'error': 'Ticker is required'}), 400
         
-        period = request.form.get('period')
-        interval = request.form.get('interval')
-        resolution = request.form.get('resolution')
-        style = request.form.get('style')
-        title = request.form.get('title')
-        chart_type = request.form.get('chart_type', 'line')
-        
-        
-        # Optional start/end dates
-        start = request.form.get('start')
-        end = request.form.get('end')
-        if not start: start = None
-        if not end: end = None
-        
-        # Optional comparison
-        compare_ticker = request.form.get('compare_ticker')
-        if compare_ticker:
-            if ',' in compare_ticker:
-                compare_ticker = [t.strip() for t in compare_ticker.split(',')]
-            else:
-                compare_ticker = compare_ticker.strip()
-        else:
-            compare_ticker = None
-
-        # Customization
-        primary_color = request.form.get('primary_color')
-        primary_type = request.form.get('primary_type', 'line')
-        compare_color = request.form.get('compare_color')
-        compare_type = request.form.get('compare_type', 'line')
-        bg_color = request.form.get('bg_color', 'transparent')
-        
-        # Advanced Customization
-        try:
-            grid_opacity = float(request.form.get('grid_opacity', 10.0)) / 100.0
-        except ValueError:
-            grid_opacity = 0.1
-        
-        # Per-Asset Settings (new feature)
-        per_asset_settings = None
-        per_asset_settings_json = request.form.get('per_asset_settings')
-        if per_asset_settings_json:
-            try:
-                import json
-                per_asset_settings = json.loads(per_asset_settings_json)
-                print(f"Per-asset settings: {per_asset_settings}")
-            except (json.JSONDecodeError, ValueError) as e:
-                print(f"Error parsing per-asset settings: {e}")
-                per_asset_settings = None
-        
-        # Output Format (PNG or SVG)
-        output_format = request.form.get('output_format', 'png').lower()
-        if output_format not in ['png', 'svg']:
-            output_format = 'png'
-        print(f"Output format: {output_format}")
-
-        # If chart_type is passed (legacy), it overrides primary_type if primary_type is default? 
-        # Actually, let's use primary_type as the source of truth if present.
-        # The form will send chart_type as 'candle' or 'line' from the old toggle. 
-        # We should unify this. Let's assume the new UI sends primary_type.
-        # But for backward compatibility or if we keep the old toggle, we need to be careful.
-        # Let's map chart_type to primary_type if primary_type is not explicitly set?
-        # Or just use chart_type as primary_type.
+        chart_kwargs = _parse_chart_form(request.form)
+        output_format = chart_kwargs['output_format']
+        artifact_id, img_bytes = _render_artifact(ticker, chart_kwargs)
         
-        # Let's use the 'chart_type' field from the form as 'primary_type' since that's what the old toggle uses.
-        # But the new UI might send 'primary_type'.
-        # Let's prefer 'primary_type' if available, else 'chart_type'.
-        
-        final_primary_type = primary_type if primary_type else chart_type
-
-        # with suppress_stdout_stderr():
-        buf = generate_chart_buffer(
-            ticker, period, interval, start, end, resolution, style, title, 
-            chart_type=final_primary_type, 
-            compare_ticker=compare_ticker,
-            primary_color=primary_color,
-            compare_color=compare_color,
-            compare_type=compare_type,
-            bg_color=bg_color,
-            grid_opacity=grid_opacity,
-            per_asset_settings=per_asset_settings,
-            output_format=output_format
-        )
-        
-        # Store image data, ticker, and format in session for download
-        img_bytes = buf.getvalue()
-        session['chart_image'] = base64.b64encode(img_bytes).decode('utf-8')
-        session['chart_ticker'] = ticker
-        session['chart_format'] = output_format
-        
-        # Return base64 for display with format info
-        return {'image': session['chart_image'], 'ticker': ticker, 'format': output_format}
+        # Return base64 for display; downloads go through the artifact URL
+        return {
+            'image': base64.b64encode(img_bytes).decode('utf-8'),
+            'ticker': ticker,
+            'format': output_format,
+            'artifact_id': artifact_id,
+            'url': url_for('download', artifact_id=artifact_id)
+        }
         
+    except RenderPoolBusy as e:
+        print(f"Render pool busy: {e}")
+        return jsonify({'error': 'Chart renderer is busy, please try again shortly'}), 503, {'Retry-After': '5'}
     except Exception as e:
         import traceback
         traceback.print_exc()
         print(f"Error generating chart: {e}")
         return jsonify({'error': str(e)}), 400
 
+def _parse_output_targets(raw):
+    """Parse an output_targets JSON list of {"resolution", "format"} objects into (resolution, format) pairs"""
+    targets = json.loads(raw)
+    if not isinstance(targets, list) or not targets:
+        raise ValueError('output_targets must be a non-empty list')
+    parsed = []
+    for target in targets:
+        resolution = target.get('resolution', '1080p')
+        output_format = target.get('format', 'png').lower()
+        if resolution not in ('1080p', '4k', 'custom'):
+            raise ValueError(f'Unknown resolution: {resolution}')
+        if output_format not in ('png', 'svg'):
+            raise ValueError(f'Unknown format: {output_format}')
+        parsed.append((resolution, output_format))
+    return list(dict.fromkeys(parsed))
+
+@app.route('/generate/export', methods=['POST'])
+def export_chart():
+    """Render several resolution/format targets from one data fetch and figure; returns artifact URLs"""
+    try:
+        ticker = request.form.get('ticker')
+        if not ticker:
+            return jsonify({'error': 'Ticker is required'}), 400
+        try:
+            targets = _parse_output_targets(request.form.get('output_targets', '[]'))
+        except (json.JSONDecodeError, ValueError, AttributeError) as e:
+            return jsonify({'error': f'Invalid output_targets: {e}'}), 400
+
+        chart_kwargs = _parse_chart_form(request.form)
+        buffers = generate_chart_buffer(ticker, **chart_kwargs, output_targets=targets)
+
+        exports = []
+        for (resolution, output_format), buf in zip(targets, buffers):
+            target_kwargs = {**chart_kwargs, 'resolution': resolution, 'output_format': output_format}
+            artifact_id = artifact_key({'ticker': ticker, **target_kwargs})
+            artifact_store.put(artifact_id, buf.getvalue(), ticker=ticker, format=output_format, created=time.time())
+            exports.append({
+                'resolution': resolution,
+                'format': output_format,
+                'artifact_id': artifact_id,
+                'url': url_for('download', artifact_id=artifact_id)
+            })
+        return jsonify({'ticker': ticker, 'exports': exports})
+
+    except RenderPoolBusy as e:
+        print(f"Render pool busy: {e}")
+        return jsonify({'error': 'Chart renderer is busy, please try again shortly'}), 503, {'Retry-After': '5'}
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"Error exporting chart: {e}")
+        return jsonify({'error': str(e)}), 400
+
+# Queued renders: request threads return a job id at once and clients poll for the artifact.
+# Jobs and the artifacts they produce are shared by all server processes.
+JOB_RENDER_RETRY_SECONDS = 5
+
+def _run_chart_job(payload, progress):
+    try:
+        artifact_id, img_bytes = _render_artifact(payload['ticker'], payload['chart_kwargs'], progress)
+    except RenderPoolBusy:
+        # Interactive /generate traffic holds the render slots; wait for one instead of failing the job
+        raise RetryLater(JOB_RENDER_RETRY_SECONDS, 'waiting for renderer')
+    return {'artifact_id': artifact_id, 'ticker': payload['ticker'],
+            'format': payload['chart_kwargs']['output_format'], 'bytes': len(img_bytes)}
+
+chart_jobs = JobQueue(_run_chart_job, name='chart-job')
+if multiprocessing.parent_process() is None:
+    # Every server process works the shared queue, so jobs outlive the worker that accepted them
+    chart_jobs.start()
+
+@app.route('/jobs/chart', methods=['POST'])
+def submit_chart_job():
+    """Queue a chart render; takes the /generate form plus an optional priority (high, normal, low)"""
+    ticker = request.form.get('ticker')
+    if not ticker:
+        return jsonify({'error': 'Ticker is required'}), 400
+    payload = {'ticker': ticker, 'chart_kwargs': _parse_chart_form(request.form)}
+    try:
+        job_id = chart_jobs.submit(payload, priority=request.form.get('priority', 'normal'))
+    except QueueFull as e:
+        print(f"Chart job queue full: {e}")
+        return jsonify({'error': 'Too many charts queued, please try again shortly'}), 503, {'Retry-After': '5'}
+    status_url = url_for('chart_job_status', job_id=job_id)
+    return jsonify({'job_id': job_id, 'status_url': status_url}), 202, {'Location': status_url}
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def chart_job_status(job_id):
+    job = chart_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['state'] == 'done':
+        artifact_id = job['result']['artifact_id']
+        if artifact_store.contains(artifact_id):
+            job['url'] = url_for('download', artifact_id=artifact_id)
+        else:
+            # The artifact store is byte-budgeted and may drop the chart before the job record expires
+            job['state'] = job['stage'] = 'expired'
+            job['error'] = 'Chart is no longer available, please submit the job again'
+    return jsonify(job)
+
+@app.route('/api/render-cache/stats', methods=['GET'])
+def render_cache_stats():
+    """Hit/miss counters for sizing the chart render cache"""
+    return jsonify(get_render_cache_stats())
+
 @app.route('/economic-data', methods=['GET'])
 def economic_data():
     try:
@@ -154,32 +300,77 @@ def economic_data():
     except Exception as e:
         return {'error': str(e)}, 500
 
+def _fetch_ticker_quote(ticker):
+    """Current price, currency and daily change for a ticker"""
+    stock = yf.Ticker(ticker)
+    info = stock.info
+    hist = stock.history(period='5d')
+    
+    if hist.empty:
+        return None
+    
+    current_price = hist['Close'].iloc[-1]
+    prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
+    change_pct = ((current_price - prev_close) / prev_close) * 100
+    
+    return {
+        "ticker": ticker,
+        "price": f"{current_price:.2f}",
+        "currency": info.get('currency', 'USD'),
+        "change_pct": change_pct,
+        "time": datetime.now().strftime("%H:%M")
+    }
+
 @app.route('/ticker-data/<ticker>', methods=['GET'])
 def ticker_data(ticker):
     """Get current ticker price and time"""
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        hist = stock.history(period='5d')
-        
-        if hist.empty:
+        # Panels polling the same ticker at once share a single upstream fetch
+        quote = quote_flight.do(ticker, _fetch_ticker_quote, ticker)
+        if quote is None:
             return jsonify({"error": "No data available"}), 404
-        
-        current_price = hist['Close'].iloc[-1]
-        prev_close = hist['Close'].iloc[-2] if len(hist) > 1 else current_price
-        change_pct = ((current_price - prev_close) / prev_close) * 100
-        
-        return jsonify({
-            "ticker": ticker,
-            "price": f"{current_price:.2f}",
-            "currency": info.get('currency', 'USD'),
-            "change_pct": change_pct,
-            "time": datetime.now().strftime("%H:%M")
-        })
+        return jsonify(quote)
     except Exception as e:
         print(f"Error fetching ticker data: {e}")
         return jsonify({"error": str(e)}), 400
 
+@app.route('/stream/quotes', methods=['GET'])
+def stream_quotes():
+    """Server-Sent Events feed of quote changes for ?tickers=AAPL,BTC-USD,..."""
+    tickers = list(dict.fromkeys(t.strip() for t in request.args.get('tickers', '').split(',') if t.strip()))
+    if not tickers:
+        return jsonify({"error": "tickers is required"}), 400
+    if len(tickers) > QUOTE_STREAM_MAX_TICKERS:
+        return jsonify({"error": f"At most {QUOTE_STREAM_MAX_TICKERS} tickers per stream"}), 400
+
+    if not _quote_stream_slots.acquire(blocking=False):
+        return jsonify({"error": "Too many open quote streams, please try again shortly"}), 503, {'Retry-After': '30'}
+    sub = quote_hub.subscribe(tickers)
+
+    def events():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                quotes = sub.get()
+                if quotes is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: quotes\ndata: {json.dumps(quotes)}\n\n"
+        finally:
+            quote_hub.unsubscribe(sub)
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    # Runs once the server closes the response, even if the client left before the first event
+    @response.call_on_close
+    def release():
+        quote_hub.unsubscribe(sub)
+        _quote_stream_slots.release()
+
+    return response
+
 @app.route('/asset-insights/<ticker>')
 def asset_insights(ticker):
     """Get comprehensive financial insights for an asset"""
@@ -194,58 +385,56 @@ def asset_insights(ticker):
 def get_news_api(country):
     """Get analyzed news for a country"""
     try:
-        from news_data import get_news
-        news = get_news(country)
+        from news_data import get_news, TREND_POINTS
+        from downsample import METHODS
+        trend_points = request.args.get('trend_points', TREND_POINTS, type=int)
+        trend_method = request.args.get('trend_method', 'lttb')
+        trend_encoding = request.args.get('trend_encoding')
+        if trend_method not in METHODS:
+            return jsonify({"error": f"trend_method must be one of {', '.join(METHODS)}"}), 400
+        if trend_encoding not in (None, 'json', 'compact'):
+            return jsonify({"error": "trend_encoding must be 'json' or 'compact'"}), 400
+        news = get_news(country, trend_points, trend_method, trend_encoding)
         return jsonify(news)
     except Exception as e:
         print(f"Error in news API: {e}")
         return jsonify({"error": str(e)}), 500
 
-@app.route('/download', methods=['POST'])
-def download():
-    try:
-        # Get image data, ticker, and format from POST request
-        data = request.get_json()
-        img_base64 = data.get('image')
-        ticker = data.get('ticker', 'chart')
-        file_format = data.get('format', 'png').lower()
-        
-        if not img_base64:
-            return {'error': 'No image data provided'}, 400
-        
-        # Decode base64 to bytes
-        img_bytes = base64.b64decode(img_base64)
-        buf = io.BytesIO(img_bytes)
-        buf.seek(0)
-        
-        # Determine MIME type and file extension
-        if file_format == 'svg':
-            mimetype = 'image/svg+xml'
-            extension = 'svg'
-        else:
-            mimetype = 'image/png'
-            extension = 'png'
-        
-        # Send file with proper headers
-        return send_file(
-            buf,
-            mimetype=mimetype,
-            as_attachment=True,
-            download_name=f'{ticker}_chart.{extension}'
-        )
-        
-    except Exception as e:
-        return {'error': str(e)}, 400
+@app.route('/download/<artifact_id>', methods=['GET'])
+def download(artifact_id):
+    entry = artifact_store.get(artifact_id)
+    if entry is None:
+        return {'error': 'Chart not found, please generate it again'}, 404
+    
+    img_bytes, meta = entry
+    file_format = meta.get('format', 'png')
+    ticker = meta.get('ticker', 'chart')
+    
+    # Send file with proper headers
+    return send_file(
+        io.BytesIO(img_bytes),
+        mimetype=MIMETYPES.get(file_format, 'image/png'),
+        as_attachment=True,
+        download_name=f'{ticker}_chart.{file_format}'
+    )
 
 # --- Templates & History API ---
-from storage import TemplateManager, HistoryManager
+from storage import create_managers
 
-template_manager = TemplateManager()
-history_manager = HistoryManager()
+# JSON files by default; STORAGE_BACKEND=sqlite for multi-worker deployments
+template_manager, history_manager = create_managers()
+
+def _cached_json(body, etag):
+    """Pre-serialized JSON with an ETag; a matching If-None-Match gets 304 Not Modified"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Browsers keep the copy but revalidate it on every load
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/api/templates', methods=['GET'])
 def get_templates():
-    return jsonify(template_manager.get_templates())
+    return _cached_json(*template_manager.templates_json())
 
 @app.route('/api/templates', methods=['POST'])
 def save_template():
@@ -266,7 +455,16 @@ def delete_template(name):
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    return jsonify(history_manager.get_history())
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    # Without paging parameters the full list is returned, as the history panel expects
+    if limit is None and cursor is None:
+        return _cached_json(*history_manager.history_json())
+    try:
+        items, next_cursor = history_manager.get_history_page(max(1, min(limit or 50, 500)), cursor)
+    except ValueError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    return jsonify({'items': items, 'next_cursor': next_cursor})
 
 @app.route('/api/history', methods=['POST'])
 def add_history():
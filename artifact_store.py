@@ -0,0 +1,185 @@
+"""
+Artifact Store Module
+Keeps rendered chart bytes server-side so they never travel through the session cookie.
+- Content-addressed: artifacts are keyed by a hash of the render parameters
+- In-memory LRU bounded by a byte budget
+- Optional shared directory that every artifact is written through to, so any server process can
+  serve an artifact another one rendered; the directory is trimmed oldest-first to shared_max_bytes
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+
+def artifact_key(params):
+    """Stable id for a dict of render parameters"""
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+SHARED_TMP_GRACE = 60  # Seconds before an unfinished write in the shared directory counts as abandoned
+
+class ArtifactStore:
+    def __init__(self, max_bytes=64 * 1024 * 1024, shared_dir=None, shared_max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.shared_dir = shared_dir
+        self.shared_max_bytes = shared_max_bytes
+        self._items = OrderedDict()  # id -> (bytes, meta, version of the shared file it matches)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._trimming = threading.Lock()
+        self._written = 0  # Bytes written to the shared directory since the last trim
+        if self.shared_dir:
+            os.makedirs(self.shared_dir, exist_ok=True)
+            self._trim_shared()
+
+    def put(self, artifact_id, data, **meta):
+        """Store bytes under artifact_id and return the id"""
+        with self._lock:
+            entry = self._items.get(artifact_id)
+        if entry is not None and entry[0] == data and entry[2] == self._shared_version(artifact_id):
+            # Same bytes as the current shared copy (e.g. a render cache hit); skip the rewrite
+            version = entry[2]
+        else:
+            version = self._write_shared(artifact_id, data, meta)
+        self._remember(artifact_id, data, meta, version)
+        return artifact_id
+
+    def get(self, artifact_id):
+        """Return (bytes, meta) or None if the artifact is unknown"""
+        version = self._shared_version(artifact_id)
+        with self._lock:
+            entry = self._items.get(artifact_id)
+            # Another process may have re-rendered the artifact since this copy was taken
+            if entry is not None and (version is None or entry[2] == version):
+                self._items.move_to_end(artifact_id)
+                return entry[0], entry[1]
+        if version is None:
+            return None
+        return self._load_shared(artifact_id)
+
+    def contains(self, artifact_id):
+        """Whether get() would find the artifact, without loading it"""
+        with self._lock:
+            if artifact_id in self._items:
+                return True
+        return self._shared_version(artifact_id) is not None
+
+    def _remember(self, artifact_id, data, meta, version):
+        with self._lock:
+            if artifact_id in self._items:
+                old = self._items.pop(artifact_id)[0]
+                self._size -= len(old)
+            self._items[artifact_id] = (data, meta, version)
+            self._size += len(data)
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, (old, _, _) = self._items.popitem(last=False)
+                self._size -= len(old)
+
+    def _shared_path(self, artifact_id, suffix='.bin'):
+        if not self.shared_dir:
+            return None
+        # Ids are hex digests; refuse anything else so paths cannot escape shared_dir
+        if not artifact_id or not all(c in '0123456789abcdef' for c in artifact_id):
+            return None
+        return os.path.join(self.shared_dir, artifact_id + suffix)
+
+    def _shared_version(self, artifact_id):
+        path = self._shared_path(artifact_id)
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _write_shared(self, artifact_id, data, meta):
+        """Write through to the shared directory; returns the new file's version, or None"""
+        path = self._shared_path(artifact_id)
+        if not path:
+            return None
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # Metadata first: readers treat the .bin file as the sign of a complete artifact
+            meta_path = self._shared_path(artifact_id, '.json')
+            with open(meta_path + suffix, 'w') as f:
+                json.dump(meta, f)
+            os.replace(meta_path + suffix, meta_path)
+            with open(path + suffix, 'wb') as f:
+                f.write(data)
+            os.replace(path + suffix, path)
+            version = os.stat(path).st_mtime_ns
+        except Exception as e:
+            print(f"Artifact write error for {artifact_id}: {e}")
+            return None
+        with self._lock:
+            self._written += len(data)
+            trim = self._written > self.shared_max_bytes // 8
+            if trim:
+                self._written = 0
+        if trim:
+            self._trim_shared()
+        return version
+
+    def _load_shared(self, artifact_id):
+        try:
+            with open(self._shared_path(artifact_id), 'rb') as f:
+                data = f.read()
+                version = os.fstat(f.fileno()).st_mtime_ns
+            meta = {}
+            meta_path = self._shared_path(artifact_id, '.json')
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+        except FileNotFoundError:
+            return None  # Trimmed since get() looked
+        except Exception as e:
+            print(f"Artifact load error for {artifact_id}: {e}")
+            return None
+        self._remember(artifact_id, data, meta, version)
+        return data, meta
+
+    def _trim_shared(self):
+        """Delete the oldest shared artifacts until the directory fits shared_max_bytes"""
+        if not self._trimming.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            artifacts = []
+            total = 0
+            for name in os.listdir(self.shared_dir):
+                path = os.path.join(self.shared_dir, name)
+                artifact_id, ext = os.path.splitext(name)
+                try:
+                    stat = os.stat(path)
+                    if ext == '.bin':
+                        artifacts.append((stat.st_mtime, artifact_id, stat.st_size))
+                        total += stat.st_size
+                    elif now - stat.st_mtime > SHARED_TMP_GRACE and (
+                            ext == '.tmp' or (ext == '.json' and not os.path.exists(path[:-5] + '.bin'))):
+                        # Abandoned writes and metadata whose artifact is gone
+                        os.remove(path)
+                except OSError:
+                    continue
+            # The newest artifact is kept even if it alone exceeds the budget
+            for _, artifact_id, size in sorted(artifacts)[:-1]:
+                if total <= self.shared_max_bytes:
+                    break
+                for suffix in ('.bin', '.json'):
+                    try:
+                        os.remove(self._shared_path(artifact_id, suffix))
+                    except OSError:
+                        pass
+                total -= size
+        except Exception as e:
+            print(f"Artifact directory trim error: {e}")
+        finally:
+            self._trimming.release()
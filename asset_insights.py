@@ -13,6 +13,10 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from singleflight import SingleFlight
+
+# Concurrent insight requests for the same asset share one set of upstream calls
+_insights_flight = SingleFlight()
 
 def calculate_rsi(prices, period=14):
     """Calculate Relative Strength Index"""
@@ -81,6 +85,9 @@ def get_asset_insights(ticker, period='1mo'):
     Returns:
         Dictionary with asset insights
     """
+    return _insights_flight.do((ticker, period), _fetch_asset_insights, ticker, period)
+
+def _fetch_asset_insights(ticker, period):
     try:
         # Fetch asset data
         asset = yf.Ticker(ticker)
@@ -0,0 +1,213 @@
+"""
+Batch Charts Module
+Renders many charts in one run of the generate_chart CLI
+- Jobs come from a manifest (JSON, YAML or CSV) or a saved template applied to a list of tickers
+- Data is fetched once per distinct series across all jobs, then shared
+- Rendering runs on the process render pool; a per-job timing report is printed at the end
+"""
+
+import csv
+import inspect
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import render_pool
+from generate_chart import generate_chart_buffer, chart_fetch_keys, get_data_many
+
+# Manifest fields besides the generate_chart_buffer arguments
+JOB_FIELDS = {'output'}
+# Render arguments a manifest may set; output_targets, prefetched and the progress callback are not data
+CHART_FIELDS = set(inspect.signature(generate_chart_buffer).parameters) - {'output_targets', 'prefetched', 'progress'}
+
+def load_manifest(path):
+    """
+    Read a manifest into (defaults, jobs).
+    JSON/YAML: a list of jobs, or {"defaults": {...}, "jobs": [...]}, or {"template": name, "tickers": [...]}.
+    CSV: one job per row, columns named like generate_chart_buffer arguments (plus "output").
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        with open(path, newline='') as f:
+            rows = [{k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+                    for row in csv.DictReader(f)]
+        return {}, rows
+
+    with open(path) as f:
+        if ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests need PyYAML (pip install pyyaml)")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if isinstance(manifest, list):
+        return {}, manifest
+    if not isinstance(manifest, dict):
+        raise ValueError("Manifest must be a list of jobs or an object with 'jobs'")
+    defaults = manifest.get('defaults', {})
+    jobs = list(manifest.get('jobs', []))
+    if manifest.get('template'):
+        jobs += template_jobs(_load_template(manifest['template']), manifest.get('tickers', []))
+    return defaults, jobs
+
+def _load_template(name):
+    from storage import TemplateManager
+    templates = TemplateManager().get_templates()
+    if name not in templates:
+        raise ValueError(f"Template not found: {name}")
+    return templates[name]
+
+def template_jobs(config, tickers):
+    """Apply a saved UI template (see collectCurrentConfig in script.js) to each ticker"""
+    selected = config.get('selected_tickers') or []
+    primary = config.get('ticker') or (selected[0] if selected else None)
+    asset_settings = config.get('asset_settings') or {}
+    compare = [t.strip() for t in (config.get('compare_ticker') or '').split(',') if t.strip()]
+
+    jobs = []
+    for ticker in tickers:
+        # The template's primary asset settings move over to the new primary ticker
+        per_asset = {t: s for t, s in asset_settings.items() if t != primary}
+        if primary in asset_settings:
+            per_asset[ticker] = {**asset_settings[primary], 'ticker': ticker}
+        job = {
+            'ticker': ticker,
+            'period': config.get('period', '1y'),
+            'chart_type': config.get('chart_type', 'line'),
+            'style': config.get('style', 'default'),
+            'bg_color': config.get('bg_color', 'transparent'),
+            'compare_ticker': [t for t in compare if t != ticker] or None,
+            'per_asset_settings': per_asset or None
+        }
+        jobs.append(job)
+    return jobs
+
+def _normalize_job(job, defaults):
+    job = {**defaults, **job}
+    unknown = set(job) - CHART_FIELDS - JOB_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown manifest fields: {', '.join(sorted(unknown))}")
+    if not job.get('ticker'):
+        raise ValueError("Every job needs a ticker")
+
+    compare = job.get('compare_ticker')
+    if isinstance(compare, str):
+        compare = [t.strip() for t in compare.split(',') if t.strip()]
+        job['compare_ticker'] = compare[0] if len(compare) == 1 else (compare or None)
+    if isinstance(job.get('per_asset_settings'), str):
+        job['per_asset_settings'] = json.loads(job['per_asset_settings'])
+    if isinstance(job.get('grid_opacity'), str):
+        job['grid_opacity'] = float(job['grid_opacity'])
+    job['output_format'] = (job.get('output_format') or 'png').lower()
+    return job
+
+def _output_path(job, output_dir, used):
+    name = job.get('output') or f"{job['ticker']}_{job.get('period', '1y')}.{job['output_format']}"
+    name = re.sub(r'[^\w.\-]', '_', name)
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while name in used:
+        n += 1
+        name = f"{stem}_{n}{ext}"
+    used.add(name)
+    return os.path.join(output_dir, name)
+
+def build_jobs(args):
+    """Resolve CLI arguments into a list of normalized jobs with output paths"""
+    # Plain CLI options act as defaults that the manifest can override
+    defaults = {'period': args.period, 'interval': args.interval, 'start': args.start, 'end': args.end,
+                'resolution': args.resolution, 'style': args.style}
+    if args.title:
+        defaults['title'] = args.title
+
+    jobs = []
+    if args.manifest:
+        manifest_defaults, manifest_jobs = load_manifest(args.manifest)
+        jobs += [_normalize_job(job, {**defaults, **manifest_defaults}) for job in manifest_jobs]
+    if args.template:
+        tickers = [t.strip() for t in args.tickers.split(',') if t.strip()]
+        jobs += [_normalize_job(job, defaults) for job in template_jobs(_load_template(args.template), tickers)]
+
+    used = set()
+    for job in jobs:
+        job['output'] = _output_path(job, args.output_dir, used)
+    return jobs
+
+def prefetch(jobs):
+    """Fetch every distinct series once. Returns {(period, start, end): {(ticker, interval): frame}}."""
+    groups = {}
+    for job in jobs:
+        keys = chart_fetch_keys(job['ticker'], job.get('interval', '1d'), job.get('chart_type', 'line'),
+                                job.get('compare_ticker'), job.get('per_asset_settings'))
+        groups.setdefault((job.get('period'), job.get('start'), job.get('end')), []).extend(keys)
+    return {group: get_data_many(keys, *group) for group, keys in groups.items()}
+
+def _run_job(job, fetched):
+    started = time.time()
+    chart_kwargs = {k: v for k, v in job.items() if k in CHART_FIELDS}
+    group = (job.get('period'), job.get('start'), job.get('end'))
+    try:
+        buf = generate_chart_buffer(prefetched=fetched.get(group), **chart_kwargs)
+        with open(job['output'], 'wb') as f:
+            f.write(buf.getbuffer())
+        status, size = 'ok', buf.getbuffer().nbytes
+        primary = chart_fetch_keys(job['ticker'], job.get('interval', '1d'), job.get('chart_type', 'line'),
+                                   per_asset_settings=job.get('per_asset_settings'))[0]
+        if isinstance(fetched.get(group, {}).get(primary), Exception):
+            # generate_chart_buffer still writes a notice image in place of the chart
+            status = 'no data'
+    except Exception as e:
+        status, size = f"error: {e}", 0
+    return {'ticker': job['ticker'], 'output': job['output'], 'status': status,
+            'seconds': round(time.time() - started, 3), 'bytes': size}
+
+def print_report(results, fetch_seconds, total_seconds):
+    print()
+    print(f"{'#':>4}  {'Ticker':<14}{'Status':<12}{'Seconds':>9}{'KB':>9}  Output")
+    for i, r in enumerate(results, 1):
+        print(f"{i:>4}  {r['ticker']:<14}{r['status'][:11]:<12}{r['seconds']:>9.2f}{r['bytes'] / 1024:>9.1f}  {r['output']}")
+        if r['status'].startswith('error'):
+            print(f"      {r['status']}")
+    ok = sum(1 for r in results if r['status'] == 'ok')
+    render_seconds = sum(r['seconds'] for r in results)
+    print(f"\n{ok}/{len(results)} charts rendered in {total_seconds:.1f}s "
+          f"(data fetch {fetch_seconds:.1f}s, render time summed over jobs {render_seconds:.1f}s)")
+
+def run_batch(args):
+    """Entry point for generate_chart.py --manifest/--template; returns the process exit code"""
+    started = time.time()
+    try:
+        jobs = build_jobs(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    if not jobs:
+        print("Manifest has no jobs")
+        return 1
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    workers = max(1, min(args.workers, len(jobs)))
+    if workers > 1:
+        render_pool.configure(workers)
+        render_pool.start()
+    print(f"Rendering {len(jobs)} charts with {workers} workers...")
+
+    fetch_started = time.time()
+    fetched = prefetch(jobs)
+    fetch_seconds = time.time() - fetch_started
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-job') as pool:
+        results = list(pool.map(lambda job: _run_job(job, fetched), jobs))
+
+    total_seconds = time.time() - started
+    print_report(results, fetch_seconds, total_seconds)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'jobs': results, 'fetch_seconds': round(fetch_seconds, 3),
+                       'total_seconds': round(total_seconds, 3)}, f, indent=4)
+    return 0 if all(not r['status'].startswith('error') for r in results) else 1
@@ -0,0 +1,65 @@
+"""
+Downsampling Module
+Reduces long series to a target point count while keeping their visual shape
+- LTTB (Largest-Triangle-Three-Buckets) for smooth line shapes
+- Min/max bucketing when every spike and dip must survive
+- Compact binary encoding (epoch-day int32 + float32 values) for JSON payloads
+"""
+
+import base64
+
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+def lttb_indices(x, y, threshold):
+    """Indices of the threshold points LTTB keeps; first and last points are always kept"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    out = np.empty(threshold, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Pick the point forming the largest triangle with the last kept point and the next bucket's average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+def minmax_indices(y, threshold):
+    """Indices of the min and max of each bucket (about threshold points in total), in order"""
+    n = len(y)
+    if threshold >= n or threshold < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, (threshold - 2) // 2 + 1).astype(np.int64)
+    keep = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        keep.append(start + int(bucket.argmin()))
+        keep.append(start + int(bucket.argmax()))
+    return np.unique(keep)
+
+def downsample_indices(x, y, threshold, method='lttb'):
+    if method == 'minmax':
+        return minmax_indices(y, threshold)
+    return lttb_indices(x, y, threshold)
+
+def encode_compact(days, values):
+    """Base64 little-endian int32 epoch days and float32 values"""
+    return {
+        'encoding': 'compact',
+        'days': base64.b64encode(np.asarray(days, dtype='<i4').tobytes()).decode('ascii'),
+        'values': base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
+    }
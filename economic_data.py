@@ -3,15 +3,27 @@ Economic Data Module
 Fetches live economic indicators from free APIs
 """
 
-import requests
+import http_client
+from singleflight import SingleFlight
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import os
+import threading
+import time
 import pandas as pd
 
 # Cache for economic data (5-minute TTL)
 _cache = {}
 _cache_ttl = 300  # 5 minutes
 
+# Background revalidation of expired cache entries
+_fetchers = {}  # key -> fetch function last used for it
+_refreshing = set()
+_refresh_lock = threading.Lock()
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='economic-refresh')
+MAX_STALE_FACTOR = 4  # Refresh periods an entry may be served past its TTL without a successful refetch
+_stale_flight = SingleFlight()
+
 # API Keys (optional, some APIs work without keys)
 FRED_API_KEY = os.getenv('FRED_API_KEY', '')  # Get free key from https://fred.stlouisfed.org/docs/api/api_key.html
 API_NINJAS_KEY = os.getenv('API_NINJAS_KEY', 'qX2i8bDzHVnKgKtKVgUBcg==3gRk5J9qVjDFvK8U')  # User provided key
@@ -32,12 +44,32 @@ FRED_SERIES = {
 }
 
 def _get_cached_or_fetch(key, fetch_func, ttl=300):
-    """Helper to cache data with TTL"""
+    """
+    Helper to cache data with TTL.
+    Expired entries are returned immediately (stale-while-revalidate) while a background
+    worker refetches them; only keys with no cached value block the caller.
+    Once an entry is older than MAX_STALE_FACTOR refresh periods (background refreshes keep
+    failing), callers fetch synchronously and get the old value flagged stale if that fails too.
+    """
     now = datetime.now()
+    _fetchers[key] = fetch_func
     if key in _cache:
         data, timestamp = _cache[key]
-        if (now - timestamp).total_seconds() < ttl:
+        age = (now - timestamp).total_seconds()
+        if age < ttl:
+            return data
+        if age < MAX_STALE_FACTOR * max(ttl, REFRESH_SCHEDULE.get(key, 0)):
+            _schedule_refresh(key)
             return data
+        try:
+            fresh = _stale_flight.do(key, fetch_func)
+        except Exception as e:
+            print(f"Refetch of stale {key} failed: {e}")
+            fresh = None
+        if fresh is not None:
+            _cache[key] = (fresh, datetime.now())
+            return fresh
+        return dict(data, stale=True) if isinstance(data, dict) else data
     
     # Fetch fresh data
     data = fetch_func()
@@ -45,27 +77,77 @@ def _get_cached_or_fetch(key, fetch_func, ttl=300):
         _cache[key] = (data, now)
     return data
 
+def _schedule_refresh(key):
+    """Queue a background refetch of key unless one is already running"""
+    with _refresh_lock:
+        if key in _refreshing or key not in _fetchers:
+            return
+        _refreshing.add(key)
+    _refresh_pool.submit(_refresh, key)
+
+def _refresh(key):
+    try:
+        data = _fetchers[key]()
+        if data is not None:
+            _cache[key] = (data, datetime.now())
+    except Exception as e:
+        print(f"Background refresh error for {key}: {e}")
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+# Indicator fan-out: getters run concurrently and the payload is returned after a deadline
+ECONOMIC_DATA_DEADLINE = 6  # seconds
+# Budget for each upstream call, retries included, so abandoned fetches free their threads soon after
+FETCH_DEADLINE = ECONOMIC_DATA_DEADLINE - 1
+_indicator_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='economic-data')
+_last_indicator_values = {}
+
 def get_economic_data():
     """
     Get all economic indicators
-    Returns dict with current values and changes
+    Returns dict with current values and changes.
+    Indicators are fetched concurrently; any that miss ECONOMIC_DATA_DEADLINE are served from
+    their last good value and listed under 'stale'; one never fetched successfully is null.
     """
-    return {
-        'jobless_claims': get_jobless_claims(),
-        'cpi': get_cpi(),
-        'pmi': get_pmi(),
-        'ism_services': get_ism_services(),
-        'interest_rate': get_interest_rate(),
-        'policy': get_policy_summary(),
-        'treasury_10y': get_treasury_10y(),
-        'treasury_2y': get_treasury_2y(),
-        'dxy': get_dxy(),
-        'm2': get_m2(),
-        'unemployment': get_unemployment(),
-        'gold': get_gold(),
-        'oil': get_oil(),
-        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    getters = {
+        'jobless_claims': get_jobless_claims,
+        'cpi': get_cpi,
+        'pmi': get_pmi,
+        'ism_services': get_ism_services,
+        'interest_rate': get_interest_rate,
+        'policy': get_policy_summary,
+        'treasury_10y': get_treasury_10y,
+        'treasury_2y': get_treasury_2y,
+        'dxy': get_dxy,
+        'm2': get_m2,
+        'unemployment': get_unemployment,
+        'gold': get_gold,
+        'oil': get_oil
     }
+    futures = {name: _indicator_pool.submit(getter) for name, getter in getters.items()}
+    # Late getters keep running in the pool and fill _cache for the next request
+    wait(futures.values(), timeout=ECONOMIC_DATA_DEADLINE)
+    
+    result = {}
+    stale = []
+    for name, future in futures.items():
+        if future.done() and future.exception() is None:
+            value = future.result()
+            _last_indicator_values[name] = value
+        else:
+            if future.done():
+                print(f"Economic indicator {name} failed: {future.exception()}")
+            # Never invent a reading: without a last good value the indicator is null and the UI skips it
+            value = _last_indicator_values.get(name)
+            if isinstance(value, dict):
+                value = dict(value, stale=True)
+            stale.append(name)
+        result[name] = value
+    
+    result['stale'] = stale
+    result['last_updated'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return result
 
 def fetch_fred_data(series_id, limit=2):
     """Fetch data from FRED API"""
@@ -82,7 +164,7 @@ def fetch_fred_data(series_id, limit=2):
     }
     
     try:
-        response = requests.get(url, params=params, timeout=5)
+        response = http_client.get(url, params=params, timeout=5, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             data = response.json()
             return data.get('observations', [])
@@ -101,7 +183,7 @@ def fetch_api_ninjas_inflation(country='United States'):
     
     try:
         # Fetching data
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             return response.json()
         else:
@@ -297,7 +379,7 @@ def get_interest_rate():
             if API_NINJAS_KEY:
                 url = 'https://api.api-ninjas.com/v1/interestrate'
                 headers = {'X-Api-Key': API_NINJAS_KEY}
-                response = requests.get(url, headers=headers, params={'name': 'federal_funds_rate'}, timeout=5)
+                response = http_client.get(url, headers=headers, params={'name': 'federal_funds_rate'}, timeout=5, deadline=FETCH_DEADLINE)
                 if response.status_code == 200:
                     result = response.json()
                     if result and 'rate_pct' in result:
@@ -536,7 +618,7 @@ def fetch_api_ninjas_interest_rate(country='United States'):
     params = {'name': country}
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -553,7 +635,7 @@ def fetch_api_ninjas_commodity(name):
     params = {'name': name}
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -570,7 +652,7 @@ def fetch_api_ninjas_exchange_rate(pair='EURUSD'):
     params = {'pair': pair}
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -810,7 +892,7 @@ def get_gold():
             'impact': 'Gold is a safe-haven asset and inflation hedge. It often rises when the dollar weakens or geopolitical uncertainty increases.'
         }
     
-    return _get_cached_or_fetch('gold', fetch)
+    return _get_cached_or_fetch('gold', fetch, ttl=3600)
 
 def get_oil():
     """Get latest WTI Crude Oil Price from FRED"""
@@ -839,7 +921,7 @@ def get_oil():
         # Fallback
         return {'value': 78.50, 'change': -1.25, 'change_pct': -1.6, 'unit': '', 'label': 'Oil (WTI)', 'ticker': 'DCOILWTICO', 'description': 'West Texas Intermediate (WTI) crude oil price per barrel.', 'impact': 'A key driver of inflation. High oil prices increase transport and production costs, dampening economic growth.'}
     
-    return _get_cached_or_fetch('oil', fetch)
+    return _get_cached_or_fetch('oil', fetch, ttl=3600)
 
 def fetch_api_ninjas_gdp(country='United States'):
     """Fetch GDP from API Ninjas"""
@@ -851,7 +933,7 @@ def fetch_api_ninjas_gdp(country='United States'):
     params = {'country': country}
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -871,7 +953,7 @@ def fetch_api_ninjas_unemployment(country='United States'):
     params = {'country': country}
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = http_client.get(url, headers=headers, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
@@ -1030,7 +1112,7 @@ def fetch_fred_historical(series_id, period='1y', interval='1d', start_date=None
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10, deadline=FETCH_DEADLINE)
         if response.status_code == 200:
             data = response.json()
             observations = data.get('observations', [])
@@ -1164,3 +1246,65 @@ def get_static_history(series_id):
         return df
 
     return None
+
+# Proactive refresh schedule (seconds): these keys are refetched shortly before they expire,
+# so dashboard requests are always served from cache
+REFRESH_SCHEDULE = {
+    'cpi': 43200,
+    'gold': 3600,
+    'oil': 3600,
+    'treasury_10y': 300,
+    'treasury_2y': 300
+}
+_SCHEDULED_GETTERS = {
+    'cpi': get_cpi,
+    'gold': get_gold,
+    'oil': get_oil,
+    'treasury_10y': get_treasury_10y,
+    'treasury_2y': get_treasury_2y
+}
+_scheduler_thread = None
+
+def _warm(key):
+    """Run the getter for a never-fetched key; it registers its fetch function and fills the cache"""
+    with _refresh_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def run():
+        try:
+            _SCHEDULED_GETTERS[key]()
+        except Exception as e:
+            print(f"Cache warm error for {key}: {e}")
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(run)
+
+def _run_refresh_scheduler(poll_seconds):
+    while True:
+        now = datetime.now()
+        for key, every in REFRESH_SCHEDULE.items():
+            try:
+                if key not in _cache:
+                    _warm(key)
+                    continue
+                age = (now - _cache[key][1]).total_seconds()
+                lead = min(every * 0.1, 300)
+                if age >= every - lead:
+                    _schedule_refresh(key)
+            except Exception as e:
+                print(f"Refresh scheduler error for {key}: {e}")
+        time.sleep(poll_seconds)
+
+def start_refresh_scheduler(poll_seconds=30):
+    """Start the background refresh scheduler (once per process)"""
+    global _scheduler_thread
+    with _refresh_lock:
+        if _scheduler_thread is not None:
+            return
+        _scheduler_thread = threading.Thread(target=_run_refresh_scheduler, args=(poll_seconds,),
+                                             name='economic-refresh-scheduler', daemon=True)
+        _scheduler_thread.start()
@@ -1,5 +1,12 @@
 import io
 import argparse
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.colors
@@ -13,10 +20,123 @@ import warnings
 warnings.filterwarnings("ignore")
 import matplotlib.lines as mlines
 import matplotlib.patches as mpatches
+import ohlcv_store
+import render_pool
+from downsample import lttb_indices
+from singleflight import SingleFlight
+
+# --- Render cache ---
+# Finished chart bytes keyed on the normalized render arguments.
+# Entries expire by interval (intraday charts go stale in minutes, daily+ in hours)
+# and the least recently used ones are evicted once the byte budget is exceeded.
+RENDER_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_render_cache = OrderedDict()  # key -> (bytes, expires_at)
+_render_cache_bytes = 0
+_render_cache_lock = threading.Lock()
+_render_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+
+def _interval_ttl(interval):
+    """Seconds a render built on bars of this interval stays fresh"""
+    interval = (interval or '1d').lower()
+    if interval in ('1m', '2m', '5m'):
+        return 60
+    if interval.endswith('m') and not interval.endswith('mo'):
+        return 300
+    if interval.endswith('h'):
+        return 600
+    if interval in ('1wk', '1mo', '3mo'):
+        return 4 * 3600
+    return 3600
+
+def _render_cache_key(ticker, period, interval, start, end, resolution, style, title, chart_type,
+                      compare_ticker, primary_color, compare_color, compare_type, bg_color,
+                      grid_opacity, per_asset_settings, output_format, up_color, down_color):
+    """Canonical, order-independent key for a render request"""
+    def color(c):
+        return c.strip().lower() if isinstance(c, str) and c.strip() else None
+
+    if compare_ticker:
+        compare = compare_ticker if isinstance(compare_ticker, list) else [compare_ticker]
+        compare = [t.strip() for t in compare if t and t.strip()]
+    else:
+        compare = []
+
+    return json.dumps({
+        'ticker': ticker.strip(),
+        'period': period or '1y',
+        'interval': interval or '1d',
+        'start': start or None,
+        'end': end or None,
+        'resolution': resolution if resolution in ('4k', 'custom') else '1080p',
+        'style': style or 'default',
+        'title': title or None,
+        'chart_type': chart_type or 'line',
+        'compare': compare,
+        'primary_color': color(primary_color),
+        'compare_color': color(compare_color),
+        'compare_type': compare_type or 'line',
+        'bg_color': color(bg_color),
+        'grid_opacity': round(float(grid_opacity if grid_opacity is not None else 0.1), 4),
+        'per_asset_settings': per_asset_settings or {},
+        'output_format': (output_format or 'png').lower(),
+        'up_color': color(up_color),
+        'down_color': color(down_color),
+    }, sort_keys=True, separators=(',', ':'), default=str)
+
+def _render_cache_get(key):
+    with _render_cache_lock:
+        entry = _render_cache.get(key)
+        if entry is None:
+            _render_cache_stats['misses'] += 1
+            return None
+        data, expires_at = entry
+        if time.time() >= expires_at:
+            _render_cache_drop(key)
+            _render_cache_stats['expired'] += 1
+            _render_cache_stats['misses'] += 1
+            return None
+        _render_cache.move_to_end(key)
+        _render_cache_stats['hits'] += 1
+        return data
+
+def _render_cache_put(key, data, ttl):
+    global _render_cache_bytes
+    with _render_cache_lock:
+        if key in _render_cache:
+            _render_cache_drop(key)
+        _render_cache[key] = (data, time.time() + ttl)
+        _render_cache_bytes += len(data)
+        while _render_cache_bytes > RENDER_CACHE_MAX_BYTES and len(_render_cache) > 1:
+            oldest = next(iter(_render_cache))
+            _render_cache_drop(oldest)
+            _render_cache_stats['evictions'] += 1
+
+def _render_cache_drop(key):
+    # Caller holds _render_cache_lock
+    global _render_cache_bytes
+    data, _ = _render_cache.pop(key)
+    _render_cache_bytes -= len(data)
+
+def get_render_cache_stats():
+    """Hit/miss counters and current size of the render cache"""
+    with _render_cache_lock:
+        stats = dict(_render_cache_stats)
+        stats['entries'] = len(_render_cache)
+        stats['bytes'] = _render_cache_bytes
+        stats['max_bytes'] = RENDER_CACHE_MAX_BYTES
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return stats
+
+def clear_render_cache():
+    global _render_cache_bytes
+    with _render_cache_lock:
+        _render_cache.clear()
+        _render_cache_bytes = 0
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Generate high-res financial charts for DaVinci Resolve.")
-    parser.add_argument("--ticker", type=str, required=True, help="Stock/Crypto ticker (e.g., AAPL, BTC-USD)")
+    parser.add_argument("--ticker", type=str, default=None, help="Stock/Crypto ticker (e.g., AAPL, BTC-USD)")
     parser.add_argument("--period", type=str, default="1y", help="Data period (e.g., 1y, 6mo, max)")
     parser.add_argument("--start", type=str, default=None, help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end", type=str, default=None, help="End date (YYYY-MM-DD)")
@@ -25,14 +145,39 @@ def parse_arguments():
     parser.add_argument("--style", type=str, choices=["default", "pink"], default="default", help="Chart style")
     parser.add_argument("--title", type=str, default=None, help="Chart title")
     parser.add_argument("--output", type=str, default=None, help="Output filename (default: ticker_chart.png)")
-    return parser.parse_args()
+    # Batch mode
+    parser.add_argument("--manifest", type=str, default=None, help="Batch manifest of chart jobs (.json, .yaml/.yml or .csv)")
+    parser.add_argument("--template", type=str, default=None, help="Saved template name (templates.json) to apply to --tickers")
+    parser.add_argument("--tickers", type=str, default=None, help="Comma-separated tickers for --template")
+    parser.add_argument("--output-dir", type=str, default="charts", help="Batch output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Batch render worker processes")
+    parser.add_argument("--report", type=str, default=None, help="Write the batch timing report as JSON to this path")
+    args = parser.parse_args()
+    if not (args.ticker or args.manifest or args.template):
+        parser.error("one of --ticker, --manifest or --template is required")
+    if args.template and not args.tickers:
+        parser.error("--template requires --tickers")
+    return args
+
+ONCHAIN_TICKERS = ['BTC.D', 'USDT.D', 'TOTAL2', 'TOTAL3', 'OTHERS.D']
+
+# Concurrent get_data calls for the same (ticker, period, interval, range) share one fetch
+_data_flight = SingleFlight()
+
+# Overlay fetches for a single chart run side by side on this pool
+_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='chart-fetch')
 
 def get_data(ticker, period, interval, start=None, end=None):
+    """Fetch OHLCV data, sharing one upstream fetch among concurrent identical requests"""
+    df = _data_flight.do((ticker, period, interval, start, end), _get_data, ticker, period, interval, start, end)
+    # Each caller gets its own frame since the fetched one may be shared
+    return df.copy()
+
+def _get_data(ticker, period, interval, start=None, end=None):
     # print(f"Downloading data for {ticker}...")
     
     # Check if this is an on-chain metric ticker
-    onchain_tickers = ['BTC.D', 'USDT.D', 'TOTAL2', 'TOTAL3', 'OTHERS.D']
-    if ticker in onchain_tickers:
+    if ticker in ONCHAIN_TICKERS:
         try:
             from onchain_data import get_onchain_metric_data
             df = get_onchain_metric_data(ticker, period)
@@ -65,14 +210,21 @@ def get_data(ticker, period, interval, start=None, end=None):
             print(f"Error fetching economic data: {e}")
             raise ValueError(f"Failed to fetch economic data for {ticker}: {str(e)}")
 
-    # Standard yfinance download for regular tickers
+    # Default interval if not provided
+    if interval is None:
+        interval = '1d'
+
+    # Period-based requests are served from the local bar store, which only downloads the missing tail
+    if not start and ohlcv_store.is_supported_period(period):
+        return ohlcv_store.get_bars(ticker, period, interval,
+                                    lambda **kwargs: _download_yf(ticker, interval, **kwargs))
+    return _download_yf(ticker, interval, period=period, start=start, end=end)
+
+def _download_yf(ticker, interval, period=None, start=None, end=None):
+    """Standard yfinance download and cleaning for regular tickers"""
     try:
         import traceback
         
-        # Default interval if not provided
-        if interval is None:
-            interval = '1d'
-            
         print(f"DEBUG: Downloading {ticker} with period={period}, interval={interval}")
         if start:
             df = yf.download(ticker, start=start, end=end, interval=interval, progress=False)
@@ -85,135 +237,252 @@ def get_data(ticker, period, interval, start=None, end=None):
             print(f"DEBUG: df.columns: {df.columns}")
             print(f"DEBUG: df.head(): {df.head()}")
 
-        if df is None or df.empty:
-            raise ValueError(f"No data returned for {ticker}")
-
-        # Handle MultiIndex columns if present (common in recent yfinance versions)
-        if isinstance(df.columns, pd.MultiIndex):
-            print("DEBUG: Handling MultiIndex columns")
-            df.columns = df.columns.get_level_values(0)
-            print(f"DEBUG: New columns: {df.columns}")
-            
-        # Basic cleaning
-        # Ensure columns exist
-        required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-             # Try to be flexible if Volume is missing (e.g. some indices)
-             if 'Volume' in missing_cols and len(missing_cols) == 1:
-                 df['Volume'] = 0
-             else:
-                 raise ValueError(f"Missing columns {missing_cols} for {ticker}")
-
-        df = df[required_cols]
-        df = df.replace([np.inf, -np.inf], np.nan)
-        df = df.dropna()
-        
-        # Ensure numeric types
-        for col in required_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-        df = df.dropna()
-        
-        if df.empty:
-            raise ValueError("No data found for the given parameters.")
-            
-        return df
+        return _clean_ohlcv(df, ticker)
     except Exception as e:
         print(f"Error downloading data for {ticker}: {e}")
         traceback.print_exc()
         raise e
 
-def get_chart_style(style_name="classic", custom_color=None, up_color=None, down_color=None, grid_opacity=0.1, line_width=1.0):
+def _clean_ohlcv(df, ticker):
+    """Normalize a yfinance frame to numeric Open/High/Low/Close/Volume columns"""
+    if df is None or df.empty:
+        raise ValueError(f"No data returned for {ticker}")
+
+    # Handle MultiIndex columns if present (common in recent yfinance versions)
+    if isinstance(df.columns, pd.MultiIndex):
+        print("DEBUG: Handling MultiIndex columns")
+        df.columns = df.columns.get_level_values(0)
+        print(f"DEBUG: New columns: {df.columns}")
+        
+    # Basic cleaning
+    # Ensure columns exist
+    required_cols = ['Open', 'High', 'Low', 'Close', 'Volume']
+    missing_cols = [col for col in required_cols if col not in df.columns]
+    if missing_cols:
+         # Try to be flexible if Volume is missing (e.g. some indices)
+         if 'Volume' in missing_cols and len(missing_cols) == 1:
+             df['Volume'] = 0
+         else:
+             raise ValueError(f"Missing columns {missing_cols} for {ticker}")
+
+    df = df[required_cols]
+    df = df.replace([np.inf, -np.inf], np.nan)
+    df = df.dropna()
+    
+    # Ensure numeric types
+    for col in required_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+    df = df.dropna()
+    
+    if df.empty:
+        raise ValueError("No data found for the given parameters.")
+        
+    return df
+
+def _download_yf_batch(tickers, interval, period=None, start=None, end=None):
+    """One threaded yfinance download for several tickers. Returns {ticker: DataFrame or Exception}."""
+    print(f"DEBUG: Batch downloading {tickers} with period={period}, interval={interval}")
+    if start:
+        raw = yf.download(tickers, start=start, end=end, interval=interval,
+                          group_by='ticker', threads=True, progress=False)
+    else:
+        raw = yf.download(tickers, period=period, interval=interval,
+                          group_by='ticker', threads=True, progress=False)
+
+    frames = {}
+    for ticker in tickers:
+        try:
+            if raw is None or raw.empty:
+                raise ValueError(f"No data returned for {ticker}")
+            if not isinstance(raw.columns, pd.MultiIndex):
+                # Older yfinance versions return flat columns for a single-ticker list
+                if len(tickers) != 1:
+                    raise ValueError(f"No data returned for {ticker}")
+                frames[ticker] = _clean_ohlcv(raw.copy(), ticker)
+                continue
+            if ticker not in raw.columns.get_level_values(0):
+                raise ValueError(f"No data returned for {ticker}")
+            frames[ticker] = _clean_ohlcv(raw[ticker].copy(), ticker)
+        except Exception as e:
+            print(f"Error in batch download for {ticker}: {e}")
+            frames[ticker] = e
+    return frames
+
+def _get_data_batch(tickers, period, interval, start=None, end=None):
+    if not start and ohlcv_store.is_supported_period(period):
+        return ohlcv_store.get_bars_batch(tickers, period, interval,
+                                          lambda subset, **kwargs: _download_yf_batch(subset, interval, **kwargs))
+    return _download_yf_batch(tickers, interval, period=period, start=start, end=end)
+
+def _is_yf_ticker(ticker):
+    from economic_data import FRED_SERIES
+    return ticker not in ONCHAIN_TICKERS and ticker not in FRED_SERIES.values()
+
+def get_data_many(keys, period, start=None, end=None):
+    """
+    Fetch several (ticker, interval) series for one chart.
+    yfinance tickers sharing an interval go out in a single batched download; FRED and
+    on-chain series are fetched concurrently alongside it.
+    Returns {(ticker, interval): DataFrame or Exception}.
+    """
+    keys = list(dict.fromkeys(keys))
+    groups = {}
+    singles = []
+    for key in keys:
+        ticker, interval = key
+        if _is_yf_ticker(ticker):
+            groups.setdefault(interval or '1d', []).append(key)
+        else:
+            singles.append(key)
+
+    batch_futures = {}
+    for interval, group in groups.items():
+        if len(group) == 1:
+            singles.append(group[0])
+            continue
+        tickers = [ticker for ticker, _ in group]
+        flight_key = ('batch', tuple(sorted(tickers)), period, interval, start, end)
+        future = _fetch_pool.submit(_data_flight.do, flight_key, _get_data_batch, tickers, period, interval, start, end)
+        batch_futures[future] = group
+
+    single_futures = {_fetch_pool.submit(get_data, ticker, period, interval, start, end): (ticker, interval)
+                      for ticker, interval in singles}
+
+    results = {}
+    for future, group in batch_futures.items():
+        try:
+            frames = future.result()
+        except Exception as e:
+            frames = {ticker: e for ticker, _ in group}
+        for ticker, interval in group:
+            frame = frames.get(ticker, ValueError(f"No data returned for {ticker}"))
+            # Batched frames may be shared with other coalesced callers
+            results[(ticker, interval)] = frame.copy() if isinstance(frame, pd.DataFrame) else frame
+    for future, key in single_futures.items():
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            results[key] = e
+    return results
+
+class _FrozenStyle(dict):
+    """Read-only mplfinance style dict; cached styles are shared across renders"""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Chart styles are shared and read-only")
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # Rebuild from a plain dict (the default pickling path goes through __setitem__)
+        return (_freeze_style, (dict(self),))
+
+    def __deepcopy__(self, memo):
+        return self
+
+def _freeze_style(value):
+    if isinstance(value, dict):
+        return _FrozenStyle({k: _freeze_style(v) for k, v in value.items()})
+    return value
+
+_STYLE_PRESETS = {
+    "pink": {
+        "up": "#FF80A0", "down": "#FF80A0",
+        "edge": "#FF80A0", "wick": "#FF80A0",
+        "label": "#E0E0E0", "tick": "#E0E0E0",
+        "axes_edge": "#606060"
+    },
+    "blue": {
+        "up": "#5AB9EA", "down": "#5AB9EA",
+        "edge": "#5AB9EA", "wick": "#5AB9EA",
+        "label": "#E0E0E0", "tick": "#E0E0E0",
+        "axes_edge": "#606060"
+    },
+    "purple": {
+        "up": "#A78BFA", "down": "#A78BFA",
+        "edge": "#A78BFA", "wick": "#A78BFA",
+        "label": "#E0E0E0", "tick": "#E0E0E0",
+        "axes_edge": "#606060"
+    },
+    "green": {
+        "up": "#34D399", "down": "#34D399",
+        "edge": "#34D399", "wick": "#34D399",
+        "label": "#E0E0E0", "tick": "#E0E0E0",
+        "axes_edge": "#606060"
+    },
+    "orange": {
+        "up": "#FB923C", "down": "#FB923C",
+        "edge": "#FB923C", "wick": "#FB923C",
+        "label": "#E0E0E0", "tick": "#E0E0E0",
+        "axes_edge": "#606060"
+    },
+    "gold": {
+        "up": "#FCD34D", "down": "#FCD34D",
+        "edge": "#FCD34D", "wick": "#FCD34D",
+        "label": "#E0E0E0", "tick": "#E0E0E0",
+        "axes_edge": "#606060"
+    },
+    "apple_2026": {
+        "up": "#0066FF", "down": "#FFFFFF",
+        "edge": "#0066FF", "wick": "#0066FF",
+        "label": "#1D1D1F", "tick": "#1D1D1F",
+        "axes_edge": "#E5E5E7"
+    },
+    "dark_mode": {
+        "up": "#10B981", "down": "#EF4444",
+        "edge": "#10B981", "wick": "#10B981",
+        "label": "#F9FAFB", "tick": "#F9FAFB",
+        "axes_edge": "#374151"
+    },
+    "terminal": {
+        "up": "#00FF00", "down": "#00FF00",
+        "edge": "#00FF00", "wick": "#00FF00",
+        "label": "#00FF00", "tick": "#00FF00",
+        "axes_edge": "#00FF00"
+    },
+    "neon": {
+        "up": "#FF00FF", "down": "#00FFFF",
+        "edge": "#FF00FF", "wick": "#FF00FF",
+        "label": "#FFFFFF", "tick": "#FFFFFF",
+        "axes_edge": "#00FFFF"
+    },
+    "minimal": {
+        "up": "#000000", "down": "#000000",
+        "edge": "#000000", "wick": "#000000",
+        "label": "#000000", "tick": "#000000",
+        "axes_edge": "#CCCCCC"
+    },
+    "classic": {
+        "up": "#00ff00", "down": "#ff0000",
+        "edge": "black", "wick": "white",
+        "label": "white", "tick": "white",
+        "axes_edge": "#808080"
+    },
+    "default": {
+        "up": "#10B981", "down": "#EF4444",  # Green (up) and Red (down)
+        "edge": "#10B981", "wick": "#10B981",
+        "label": "#000000", "tick": "#000000",
+        "axes_edge": "#CCCCCC"
+    }
+}
+
+def get_chart_style(style_name="classic", custom_color=None, up_color=None, down_color=None, grid_opacity=0.1, line_width=1.0, bg_color=None):
     """
     Returns mplfinance style based on preset or custom colors.
     up_color: Color for bullish (up) candles
     down_color: Color for bearish (down) candles
     custom_color: Legacy single color parameter (applies to both up and edge/wick)
+    bg_color: Figure/axes background baked into the style rc (None or "transparent" keeps it clear)
+    Styles are built once per argument combination and returned read-only.
     """
-    styles = {
-        "pink": {
-            "up": "#FF80A0", "down": "#FF80A0",
-            "edge": "#FF80A0", "wick": "#FF80A0",
-            "label": "#E0E0E0", "tick": "#E0E0E0",
-            "axes_edge": "#606060"
-        },
-        "blue": {
-            "up": "#5AB9EA", "down": "#5AB9EA",
-            "edge": "#5AB9EA", "wick": "#5AB9EA",
-            "label": "#E0E0E0", "tick": "#E0E0E0",
-            "axes_edge": "#606060"
-        },
-        "purple": {
-            "up": "#A78BFA", "down": "#A78BFA",
-            "edge": "#A78BFA", "wick": "#A78BFA",
-            "label": "#E0E0E0", "tick": "#E0E0E0",
-            "axes_edge": "#606060"
-        },
-        "green": {
-            "up": "#34D399", "down": "#34D399",
-            "edge": "#34D399", "wick": "#34D399",
-            "label": "#E0E0E0", "tick": "#E0E0E0",
-            "axes_edge": "#606060"
-        },
-        "orange": {
-            "up": "#FB923C", "down": "#FB923C",
-            "edge": "#FB923C", "wick": "#FB923C",
-            "label": "#E0E0E0", "tick": "#E0E0E0",
-            "axes_edge": "#606060"
-        },
-        "gold": {
-            "up": "#FCD34D", "down": "#FCD34D",
-            "edge": "#FCD34D", "wick": "#FCD34D",
-            "label": "#E0E0E0", "tick": "#E0E0E0",
-            "axes_edge": "#606060"
-        },
-        "apple_2026": {
-            "up": "#0066FF", "down": "#FFFFFF",
-            "edge": "#0066FF", "wick": "#0066FF",
-            "label": "#1D1D1F", "tick": "#1D1D1F",
-            "axes_edge": "#E5E5E7"
-        },
-        "dark_mode": {
-            "up": "#10B981", "down": "#EF4444",
-            "edge": "#10B981", "wick": "#10B981",
-            "label": "#F9FAFB", "tick": "#F9FAFB",
-            "axes_edge": "#374151"
-        },
-        "terminal": {
-            "up": "#00FF00", "down": "#00FF00",
-            "edge": "#00FF00", "wick": "#00FF00",
-            "label": "#00FF00", "tick": "#00FF00",
-            "axes_edge": "#00FF00"
-        },
-        "neon": {
-            "up": "#FF00FF", "down": "#00FFFF",
-            "edge": "#FF00FF", "wick": "#FF00FF",
-            "label": "#FFFFFF", "tick": "#FFFFFF",
-            "axes_edge": "#00FFFF"
-        },
-        "minimal": {
-            "up": "#000000", "down": "#000000",
-            "edge": "#000000", "wick": "#000000",
-            "label": "#000000", "tick": "#000000",
-            "axes_edge": "#CCCCCC"
-        },
-        "classic": {
-            "up": "#00ff00", "down": "#ff0000",
-            "edge": "black", "wick": "white",
-            "label": "white", "tick": "white",
-            "axes_edge": "#808080"
-        },
-        "default": {
-            "up": "#10B981", "down": "#EF4444",  # Green (up) and Red (down)
-            "edge": "#10B981", "wick": "#10B981",
-            "label": "#000000", "tick": "#000000",
-            "axes_edge": "#CCCCCC"
-        }
-    }
-    
+    if bg_color == "transparent":
+        bg_color = None
+    return _build_chart_style(style_name, custom_color or None, up_color or None, down_color or None,
+                              float(grid_opacity), float(line_width), bg_color or None)
+
+@lru_cache(maxsize=64)
+def _build_chart_style(style_name, custom_color, up_color, down_color, grid_opacity, line_width, bg_color):
     # Default to classic if style not found
-    style = styles.get(style_name, styles["classic"])
+    style = dict(_STYLE_PRESETS.get(style_name, _STYLE_PRESETS["classic"]))
     
     # Override with custom up/down colors if provided
     if up_color:
@@ -250,7 +519,7 @@ def get_chart_style(style_name="classic", custom_color=None, up_color=None, down
         grid_color = base_grid
         gridstyle = "-"
 
-    return mpf.make_mpf_style(
+    return _freeze_style(mpf.make_mpf_style(
         base_mpl_style="seaborn-v0_8-darkgrid",
         marketcolors=mpf.make_marketcolors(
             up=style["up"], down=style["down"],
@@ -259,8 +528,8 @@ def get_chart_style(style_name="classic", custom_color=None, up_color=None, down
         gridstyle=gridstyle,
         gridcolor=grid_color,
         rc={
-            "figure.facecolor": "none",
-            "axes.facecolor": "none",
+            "figure.facecolor": bg_color or "none",
+            "axes.facecolor": bg_color or "none",
             "axes.labelcolor": style["label"],
             "xtick.color": style["tick"],
             "ytick.color": style["tick"],
@@ -270,12 +539,43 @@ def get_chart_style(style_name="classic", custom_color=None, up_color=None, down
             "grid.alpha": grid_opacity,
             "lines.linewidth": line_width
         }
-    )
+    ))
+
+# --- Notice images ---
+# Error paths fire hardest when Yahoo is throttling us, so each distinct notice is drawn once
+# Notices are a fixed set of messages; error details go to the log, not into the image,
+# so an error storm across many tickers still hits the same few cache entries
+NOTICE_CACHE_SIZE = 32
+NOTICES = {
+    'insufficient_data': "Insufficient data for this timeframe.\nPlease choose a shorter timeframe.",
+    'fetch_error': "Could not load data for this chart.\nPlease try again shortly.",
+    'render_error': "Error generating chart.\nPlease try again."
+}
+_notice_cache = OrderedDict()  # (notice, style_name, width, height) -> PNG bytes
+_notice_lock = threading.Lock()
+_notice_flight = SingleFlight()
 
-def create_notice_image(text, width=1920, height=1080, style_name="default"):
+def create_notice_image(notice, width=1920, height=1080, style_name="default"):
     """
-    Creates an image with a centered notice message.
+    Creates an image with one of the centered NOTICES messages.
+    Rendered PNGs are cached per (notice, style, size), so repeated notices cost a dict lookup.
     """
+    text = NOTICES[notice]
+    key = (notice, style_name, width, height)
+    with _notice_lock:
+        data = _notice_cache.get(key)
+        if data is not None:
+            _notice_cache.move_to_end(key)
+    if data is None:
+        data = _notice_flight.do(key, _render_notice, text, width, height, style_name)
+        with _notice_lock:
+            _notice_cache[key] = data
+            _notice_cache.move_to_end(key)
+            while len(_notice_cache) > NOTICE_CACHE_SIZE:
+                _notice_cache.popitem(last=False)
+    return io.BytesIO(data)
+
+def _render_notice(text, width, height, style_name):
     # Get style colors
     style = get_chart_style(style_name)
     bg_color = style.get("axes.facecolor", "#0E1117")
@@ -305,16 +605,109 @@ def create_notice_image(text, width=1920, height=1080, style_name="default"):
     # Save to buffer
     buf = io.BytesIO()
     fig.savefig(buf, format='png', facecolor=bg_color, edgecolor='none')
-    buf.seek(0)
     matplotlib.pyplot.close(fig)
     
-    return buf
+    return buf.getvalue()
+
+# --- Level of detail ---
+# A figure can't show more distinct columns than it has pixels, so long series are
+# reduced to the output width before plotting. Set CHART_LOD=0 to plot every bar.
+LOD_ENABLED = os.getenv('CHART_LOD', '1') != '0'
+LOD_CANDLE_PIXELS = 3  # Narrowest candle/bar still drawn distinctly
+_OHLC_AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def _reduce_for_width(df, chart_type, width_px):
+    """LTTB for line/area charts, coarser OHLC bars for candle-like charts"""
+    if chart_type in ('line', 'area'):
+        target = int(width_px)
+        if len(df) <= target:
+            return df
+        # mplfinance spaces bars by row, so LTTB runs on row positions
+        keep = lttb_indices(np.arange(len(df)), df['Close'].to_numpy(dtype=np.float64), target)
+        return df.iloc[keep]
+
+    if chart_type not in ('candle', 'ohlc', 'hollow_and_filled'):
+        return df  # renko/pnf build their own bricks from every close
+    target = int(width_px // LOD_CANDLE_PIXELS)
+    if len(df) <= target:
+        return df
+    # Merge runs of consecutive rows into one bar each, stamped with the run's last timestamp: the bar
+    # closes there, so overlays aligned to this index with method='nearest' pick the matching close
+    rows_per_bar = -(-len(df) // target)
+    buckets = np.arange(len(df)) // rows_per_bar
+    reduced = df.groupby(buckets).agg({col: _OHLC_AGG.get(col, 'last') for col in df.columns})
+    reduced.index = df.index[np.minimum((reduced.index.to_numpy() + 1) * rows_per_bar, len(df)) - 1]
+    return reduced
+
+# Figure size (inches) and DPI per output resolution
+RESOLUTIONS = {
+    '1080p': ((19.2, 10.8), 100),
+    '4k': ((19.2, 10.8), 200),
+    'custom': ((15.66, 10.8), 100)
+}
+
+def chart_fetch_keys(ticker, interval, chart_type="line", compare_ticker=None, per_asset_settings=None):
+    """The (ticker, interval) series a chart needs, primary first"""
+    primary_settings = (per_asset_settings or {}).get(ticker, {})
+    if primary_settings.get('chartType', chart_type) in ['candle', 'ohlc', 'hollow_and_filled']:
+        interval = primary_settings.get('candleInterval', interval)
+    keys = [(ticker, interval)]
+    if compare_ticker:
+        for comp_ticker in compare_ticker if isinstance(compare_ticker, list) else [compare_ticker]:
+            comp_settings = (per_asset_settings or {}).get(comp_ticker, {})
+            keys.append((comp_ticker, comp_settings.get('candleInterval', interval)))
+    return keys
 
 def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=None, 
                           resolution="1080p", style="default", title=None, chart_type="line", compare_ticker=None,
                           primary_color=None, compare_color=None, compare_type="line", bg_color=None,
                           grid_opacity=0.1, per_asset_settings=None, output_format="png",
-                          up_color=None, down_color=None):
+                          up_color=None, down_color=None, output_targets=None, prefetched=None, progress=None):
+    """
+    Render a chart to an in-memory buffer, reusing a cached render when one is fresh.
+    output_targets: optional list of (resolution, output_format) pairs. When given, a list with one
+    buffer per target is returned, all saved from a single data fetch and figure.
+    prefetched: optional {(ticker, interval): DataFrame or Exception} from get_data_many for the same
+    period/start/end; series found there are not fetched again.
+    progress: optional callable, called with 'fetching' and then 'rendering' as a fresh render proceeds.
+    """
+    targets = [(res, (fmt or 'png').lower()) for res, fmt in output_targets] if output_targets \
+        else [(resolution, output_format)]
+    keys = [_render_cache_key(ticker, period, interval, start, end, res, style, title, chart_type,
+                              compare_ticker, primary_color, compare_color, compare_type, bg_color,
+                              grid_opacity, per_asset_settings, fmt, up_color, down_color)
+            for res, fmt in targets]
+    results = [_render_cache_get(key) for key in keys]
+    missing = [i for i, data in enumerate(results) if data is None]
+
+    if missing:
+        outputs, rendered = _render_chart(ticker, period, interval, start, end, [targets[i] for i in missing],
+                                          style, title, chart_type, compare_ticker, primary_color, compare_color,
+                                          compare_type, bg_color, grid_opacity, per_asset_settings,
+                                          up_color, down_color, prefetched, progress)
+        intervals = [interval] + [opts['candleInterval'] for opts in (per_asset_settings or {}).values()
+                                  if isinstance(opts, dict) and opts.get('candleInterval')]
+        ttl = min(_interval_ttl(i) for i in intervals)
+        for i, data in zip(missing, outputs):
+            results[i] = data
+            # Only real charts are cached; notice images reflect transient upstream failures
+            if rendered:
+                _render_cache_put(keys[i], data, ttl)
+
+    buffers = [io.BytesIO(data) for data in results]
+    return buffers if output_targets else buffers[0]
+
+def _notice_outputs(notice, style_name, targets):
+    data = create_notice_image(notice, style_name=style_name).getvalue()
+    return [data] * len(targets), False
+
+def _render_chart(ticker, period, interval, start, end, targets, style, title, chart_type, compare_ticker,
+                  primary_color, compare_color, compare_type, bg_color, grid_opacity, per_asset_settings,
+                  up_color, down_color, prefetched=None, progress=None):
+    """
+    Fetch data and draw the chart once for every (resolution, output_format) target.
+    Returns (list of bytes, rendered) where rendered is False for notice images.
+    """
     
     # Default line width
     line_width = 1.5
@@ -334,15 +727,60 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
     
     print(f"Generating chart for {ticker} with interval {interval}, type {chart_type}, up={up_color}, down={down_color}")
 
+    tickers_to_compare = []
+    if compare_ticker:
+        tickers_to_compare = compare_ticker if isinstance(compare_ticker, list) else [compare_ticker]
+
+    # Fetch primary and overlay data together so latency is max(fetch) rather than sum(fetch)
+    fetch_keys = chart_fetch_keys(ticker, interval, chart_type, tickers_to_compare, per_asset_settings)
+    prefetched = prefetched or {}
+    missing = [key for key in fetch_keys if key not in prefetched]
+    if progress:
+        progress('fetching')
+    fetched = get_data_many(missing, period, start, end) if missing else {}
+    for key in fetch_keys:
+        if key in prefetched:
+            frame = prefetched[key]
+            # Prefetched frames are shared between the jobs of a batch
+            fetched[key] = frame.copy() if isinstance(frame, pd.DataFrame) else frame
+
     # Fetch Primary Data
     try:
-        df = get_data(ticker, period, interval, start, end)
+        df = fetched[(ticker, interval)]
+        if isinstance(df, Exception):
+            raise df
     except ValueError as e:
         print(f"Generating notice image for error: {e}")
-        return create_notice_image("Insufficient data for this timeframe.\nPlease choose a shorter timeframe.", style_name=style)
+        return _notice_outputs('insufficient_data', style, targets)
     except Exception as e:
         print(f"Unexpected error fetching data: {e}")
-        return create_notice_image(f"Error: {str(e)}", style_name=style)
+        return _notice_outputs('fetch_error', style, targets)
+
+    spec = dict(
+        ticker=ticker, interval=interval, targets=targets, style=style, title=title,
+        chart_type=chart_type, tickers_to_compare=tickers_to_compare, primary_color=primary_color,
+        compare_color=compare_color, compare_type=compare_type, bg_color=bg_color,
+        grid_opacity=grid_opacity, per_asset_settings=per_asset_settings,
+        up_color=up_color, down_color=down_color, primary_settings=primary_settings, line_width=line_width
+    )
+    if progress:
+        progress('rendering')
+    if render_pool.enabled():
+        return render_pool.render(draw_chart_bytes, fetched, spec)
+    return _draw_chart(fetched, **spec)
+
+def draw_chart_bytes(fetched, spec):
+    """Render-pool entry point"""
+    return _draw_chart(fetched, **spec)
+
+def _draw_chart(fetched, ticker, interval, targets, style, title, chart_type, tickers_to_compare,
+                primary_color, compare_color, compare_type, bg_color, grid_opacity, per_asset_settings,
+                up_color, down_color, primary_settings, line_width):
+    """
+    Plot prefetched data and save the figure once per (resolution, output_format) target.
+    Pure CPU work, so it can run in a render worker process.
+    """
+    df = fetched[(ticker, interval)]
 
     # Apply Scale to Primary Data
     primary_scale = primary_settings.get('scale', 'linear')
@@ -370,6 +808,17 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
     # We might need to manipulate axes after plotting.
     primary_time_axis = primary_settings.get('timeAxis', 'bottom')
 
+    # Resolution settings; the figure is built at the first target's size and resized per target
+    sizes = [RESOLUTIONS.get(resolution, RESOLUTIONS['1080p']) for resolution, _ in targets]
+    figsize = sizes[0][0]
+    
+    # Level of detail: reduce before overlays are aligned to the primary index
+    if LOD_ENABLED:
+        bars = len(df)
+        df = _reduce_for_width(df, chart_type, max(size[0] * dpi for size, dpi in sizes))
+        if len(df) < bars:
+            print(f"DEBUG: LOD reduced {ticker} from {bars} to {len(df)} bars")
+
     # Comparison Data & Overlays
     addplot = []
     legend_items = [] # List of (label, color)
@@ -377,9 +826,7 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
     # Add primary to legend
     legend_items.append((ticker, primary_color if primary_color else 'black'))
 
-    if compare_ticker:
-        tickers_to_compare = compare_ticker if isinstance(compare_ticker, list) else [compare_ticker]
-        
+    if tickers_to_compare:
         # Color cycle
         overlay_colors = ['#FF9500', '#AF52DE', '#FF2D55', '#5856D6', '#FFCC00', '#00C7BE']
         if compare_color:
@@ -398,9 +845,10 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
                 comp_scale = comp_settings.get('scale', 'linear')
                 comp_price_axis = comp_settings.get('priceAxis', 'right') # Default opposite to typical primary
                 
-                # Fetch Data
-                print(f"Fetching overlay {comp_ticker} with interval {comp_interval}")
-                comp_df = get_data(comp_ticker, period, comp_interval, start, end)
+                # Data was prefetched alongside the primary series
+                comp_df = fetched[(comp_ticker, comp_interval)]
+                if isinstance(comp_df, Exception):
+                    raise comp_df
                 
                 if not comp_df.empty:
                     # Align index
@@ -431,17 +879,6 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
             except Exception as e:
                 print(f"Error adding comparison for {comp_ticker}: {e}")
 
-    # Resolution settings
-    if resolution == "4k":
-        figsize = (19.2, 10.8)
-        dpi = 200
-    elif resolution == "custom":
-        figsize = (15.66, 10.8)
-        dpi = 100
-    else: # 1080p
-        figsize = (19.2, 10.8)
-        dpi = 100 
-    
     # Theme / Style Handling
     axisoff = False
     if style == 'minimalistic':
@@ -462,7 +899,7 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
     plot_kwargs = dict(
         type=chart_type,
         style=get_chart_style(style_name, custom_color=primary_color, up_color=up_color, down_color=down_color, 
-                              grid_opacity=grid_opacity, line_width=line_width),
+                              grid_opacity=grid_opacity, line_width=line_width, bg_color=bg_color),
         volume=False,
         figsize=figsize,
         datetime_format='%b %Y',
@@ -490,15 +927,6 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
     if addplot:
         plot_kwargs['addplot'] = addplot
 
-    # Apply background to style rc
-    if not is_transparent and bg_color:
-        import copy
-        modified_style = copy.deepcopy(plot_kwargs["style"])
-        if hasattr(modified_style, 'rc'):
-            modified_style.rc['figure.facecolor'] = bg_color
-            modified_style.rc['axes.facecolor'] = bg_color
-        plot_kwargs["style"] = modified_style
-
     # Generate Plot
     try:
         fig, axlist = mpf.plot(df, **plot_kwargs)
@@ -540,34 +968,41 @@ def generate_chart_buffer(ticker, period="1y", interval="1d", start=None, end=No
         # Adjust layout to make room for legend
         plt.subplots_adjust(bottom=0.15)
         
-        # Save to buffer
-        buf = io.BytesIO()
-        
-        # Choose format based on output_format parameter
-        if output_format == 'svg':
-            # Save as SVG for infinite zoom with ultra-sharp quality
-            fig.savefig(buf, format='svg', transparent=is_transparent, 
-                       facecolor=fig_bgcolor if not is_transparent else 'none', 
-                       bbox_inches='tight')
-        else:
-            # Save as PNG (default)
-            fig.savefig(buf, dpi=dpi, format='png', transparent=is_transparent, 
-                       facecolor=fig_bgcolor if not is_transparent else 'none', 
-                       bbox_inches='tight')
+        # Save the same figure for every target; only size, DPI and encoder change
+        outputs = []
+        for (_, output_format), (target_figsize, dpi) in zip(targets, sizes):
+            fig.set_size_inches(*target_figsize)
+            buf = io.BytesIO()
+            
+            # Choose format based on output_format parameter
+            if output_format == 'svg':
+                # Save as SVG for infinite zoom with ultra-sharp quality
+                fig.savefig(buf, format='svg', transparent=is_transparent, 
+                           facecolor=fig_bgcolor if not is_transparent else 'none', 
+                           bbox_inches='tight')
+            else:
+                # Save as PNG (default)
+                fig.savefig(buf, dpi=dpi, format='png', transparent=is_transparent, 
+                           facecolor=fig_bgcolor if not is_transparent else 'none', 
+                           bbox_inches='tight')
+            outputs.append(buf.getvalue())
         
-        buf.seek(0)
         plt.close(fig)
-        return buf
+        return outputs, True
         
     except Exception as e:
         print(f"Error generating chart: {e}")
         import traceback
         traceback.print_exc()
-        return create_notice_image(f"Error generating chart: {str(e)}", style_name=style_name)
+        return _notice_outputs('render_error', style_name, targets)
 
 def main():
     args = parse_arguments()
     
+    if args.manifest or args.template:
+        from batch_charts import run_batch
+        sys.exit(run_batch(args))
+    
     print(f"Generating chart for {args.ticker}...")
     try:
         buf = generate_chart_buffer(args.ticker, args.period, args.interval, args.start, args.end,
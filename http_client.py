@@ -0,0 +1,109 @@
+"""
+HTTP Client Module
+Pooled HTTP sessions for all outbound API calls
+- One requests.Session per thread (Session is not thread-safe); fetch pool threads are long-lived,
+  so each keeps its keep-alive connections instead of a fresh TCP+TLS handshake per request
+- Bounded retries with exponential backoff for 429/5xx responses and connection errors
+- Every call has a total time budget (deadline) covering all attempts and backoff sleeps
+- Per-host concurrency limits so fan-outs don't trip upstream rate limits; a slot is only held
+  while a request is in flight, never during backoff
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = 16  # Distinct hosts kept in each thread's pool
+POOL_MAXSIZE = 4  # Keep-alive connections per host per thread
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.5  # 0.5s, 1s between attempts
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_DEADLINE = 20  # Seconds for a whole call, retries included
+
+# Simultaneous requests allowed per host
+DEFAULT_HOST_LIMIT = 8
+HOST_LIMITS = {
+    'api.coingecko.com': 2,  # Free tier: 30 calls/min
+    'api.stlouisfed.org': 4,
+    'api.api-ninjas.com': 4,
+    'news.google.com': 6
+}
+
+_local = threading.local()
+_semaphores_lock = threading.Lock()
+_host_semaphores = {}
+
+def _build_session():
+    # Retries are done in get() so that backoff happens outside the host slot and within the deadline
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_session():
+    """This thread's pooled session"""
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = _build_session()
+    return session
+
+def _host_semaphore(url):
+    host = urlsplit(url).hostname or ''
+    with _semaphores_lock:
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+            _host_semaphores[host] = semaphore
+    return semaphore
+
+def _cap_timeout(timeout, remaining):
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(min(t, remaining) if t is not None else remaining for t in timeout)
+    return min(timeout, remaining)
+
+def get(url, deadline=None, **kwargs):
+    """
+    requests.get through this thread's pooled session, respecting the per-host concurrency limit.
+    deadline: seconds the whole call may take, including waiting for a host slot, retries and backoff
+    (default DEFAULT_DEADLINE). Callers with their own overall deadline should pass a smaller one.
+    Returns the last response (possibly a 429/5xx) or raises the last connection error/timeout.
+    """
+    end = time.monotonic() + (deadline if deadline is not None else DEFAULT_DEADLINE)
+    timeout = kwargs.pop('timeout', None)
+    semaphore = _host_semaphore(url)
+    error = None
+
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            # Back off without holding a host slot, and only if there is time for another try
+            delay = BACKOFF_FACTOR * (2 ** (attempt - 1))
+            if time.monotonic() + delay >= end:
+                break
+            time.sleep(delay)
+
+        remaining = end - time.monotonic()
+        if remaining <= 0 or not semaphore.acquire(timeout=remaining):
+            error = error or requests.exceptions.Timeout(f"No free connection slot for {url} before the deadline")
+            break
+        try:
+            response = get_session().get(url, timeout=_cap_timeout(timeout, end - time.monotonic()), **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+            continue
+        finally:
+            semaphore.release()
+
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+        error = None
+        last_response = response
+
+    if error is None:
+        return last_response
+    raise error
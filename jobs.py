@@ -0,0 +1,254 @@
+"""
+Jobs Module
+Priority queue for long-running work such as chart renders, kept in SQLite so every server process
+(gunicorn worker) sees the same jobs
+- Each process runs a fixed pool of worker threads that claim jobs lowest priority value first,
+  FIFO within a priority
+- Queue depth is bounded; submitting to a full queue raises QueueFull
+- Finished jobs are kept for JOB_RETENTION seconds so clients can poll any process for their result
+- A handler raising RetryLater puts its job back in the queue after a delay instead of failing it
+- Running jobs are kept alive by a heartbeat; a job whose process died is requeued
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+
+JOB_DB = os.getenv('JOB_DB', os.path.join('data_cache', 'jobs.db'))
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))  # Worker threads per server process
+JOB_QUEUE_DEPTH = int(os.getenv('JOB_QUEUE_DEPTH', '32'))  # Jobs allowed to wait (running ones not counted)
+JOB_RETENTION = 600
+JOB_MAX_RETRIES = 60  # Requeues allowed per job before it is marked failed
+JOB_POLL_SECONDS = 0.5  # How often idle workers look for jobs submitted by other processes
+JOB_HEARTBEAT_SECONDS = 10
+JOB_STALL_SECONDS = 60  # A running job without a heartbeat for this long is requeued
+
+PRIORITIES = {'high': 0, 'normal': 1, 'low': 2}
+
+JOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    queue TEXT NOT NULL,
+    state TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    heartbeat REAL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    payload TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_waiting ON jobs (queue, state, priority, seq);
+"""
+
+# Columns returned by JobQueue.get()
+_PUBLIC = ('id', 'state', 'stage', 'priority', 'created', 'started', 'finished', 'retries', 'result', 'error')
+
+class QueueFull(Exception):
+    """Too many jobs are waiting; the caller should retry later"""
+
+class RetryLater(Exception):
+    """Raised by a handler when a job cannot run yet; it is requeued after delay seconds"""
+    def __init__(self, delay, stage='waiting'):
+        super().__init__(stage)
+        self.delay = delay
+        self.stage = stage
+
+class JobQueue:
+    def __init__(self, handler, workers=JOB_WORKERS, max_depth=JOB_QUEUE_DEPTH, name='job', path=JOB_DB):
+        """
+        handler(payload, progress) runs in a worker thread; progress(stage) updates the job's stage.
+        Payloads and results must be JSON-serializable. Queues sharing a database are told apart by name.
+        """
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.name = name
+        self.path = path
+        self._local = threading.local()
+        self._wake = threading.Condition()
+        self._running = set()  # Ids of jobs this process is working on
+        self._threads = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(JOB_SCHEMA)
+
+    def _connect(self):
+        # sqlite3 connections are per thread
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def _transaction(self, fn):
+        db = self._connect()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(db)
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+        return result
+
+    def start(self):
+        """Start this process's worker threads (also done on the first submit)"""
+        with self._wake:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, daemon=True, name=f'{self.name}-worker-{i}')
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._heartbeat, daemon=True, name=f'{self.name}-heartbeat')
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, payload, priority='normal'):
+        """Queue a job and return its id"""
+        priority = PRIORITIES.get(priority, PRIORITIES['normal'])
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        def insert(db):
+            db.execute('DELETE FROM jobs WHERE queue = ? AND finished < ?', (self.name, now - JOB_RETENTION))
+            # Jobs waiting out a RetryLater delay are still queued and count against the limit
+            waiting = db.execute("SELECT COUNT(*) FROM jobs WHERE queue = ? AND state = 'queued'",
+                                 (self.name,)).fetchone()[0]
+            if waiting >= self.max_depth:
+                raise QueueFull(f"{waiting} jobs already waiting")
+            db.execute(
+                "INSERT INTO jobs (id, queue, state, stage, priority, created, payload) "
+                "VALUES (?, ?, 'queued', 'queued', ?, ?, ?)",
+                (job_id, self.name, priority, now, json.dumps(payload))
+            )
+
+        self._transaction(insert)
+        self.start()
+        with self._wake:
+            self._wake.notify()
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of a job's state (without its payload), or None if unknown or expired"""
+        db = self._connect()
+        row = db.execute('SELECT * FROM jobs WHERE id = ? AND queue = ?', (job_id, self.name)).fetchone()
+        if row is None or (row['finished'] and row['finished'] < time.time() - JOB_RETENTION):
+            return None
+        snapshot = {key: row[key] for key in _PUBLIC}
+        snapshot['result'] = json.loads(row['result']) if row['result'] else None
+        if row['state'] == 'queued':
+            # Jobs that will be picked up before this one
+            snapshot['position'] = db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE queue = ? AND state = 'queued' "
+                "AND (priority < ? OR (priority = ? AND seq < ?))",
+                (self.name, row['priority'], row['priority'], row['seq'])
+            ).fetchone()[0]
+        return snapshot
+
+    def stats(self):
+        rows = self._connect().execute(
+            'SELECT state, COUNT(*) AS n FROM jobs WHERE queue = ? AND (finished IS NULL OR finished >= ?) '
+            'GROUP BY state', (self.name, time.time() - JOB_RETENTION)
+        )
+        states = {row['state']: row['n'] for row in rows}
+        return {'workers': self.workers, 'max_depth': self.max_depth, 'waiting': states.get('queued', 0), **states}
+
+    def _update(self, job_id, **fields):
+        columns = ', '.join(f'{key} = ?' for key in fields)
+        self._connect().execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+
+    def _claim(self):
+        """Mark the next runnable job as running and return (id, payload), or None"""
+        now = time.time()
+
+        def claim(db):
+            # Requeue jobs whose process stopped sending heartbeats (crashed or restarted)
+            stalled = "queue = ? AND state = 'running' AND heartbeat < ?"
+            db.execute(
+                f"UPDATE jobs SET state = 'failed', stage = 'failed', finished = ?, payload = NULL, "
+                f"error = 'Worker stopped while running the job' WHERE {stalled} AND retries >= ?",
+                (now, self.name, now - JOB_STALL_SECONDS, JOB_MAX_RETRIES)
+            )
+            db.execute(
+                f"UPDATE jobs SET state = 'queued', stage = 'queued', retries = retries + 1 WHERE {stalled}",
+                (self.name, now - JOB_STALL_SECONDS)
+            )
+            row = db.execute(
+                "SELECT id, payload FROM jobs WHERE queue = ? AND state = 'queued' AND not_before <= ? "
+                "ORDER BY priority, seq LIMIT 1", (self.name, now)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET state = 'running', stage = 'running', started = ?, heartbeat = ? WHERE id = ?",
+                (now, now, row['id'])
+            )
+            return row['id'], json.loads(row['payload'])
+
+        return self._transaction(claim)
+
+    def _heartbeat(self):
+        while True:
+            time.sleep(JOB_HEARTBEAT_SECONDS)
+            with self._wake:
+                running = list(self._running)
+            try:
+                for job_id in running:
+                    self._update(job_id, heartbeat=time.time())
+            except sqlite3.Error as e:
+                print(f"Job heartbeat failed: {e}")
+
+    def _work(self):
+        while True:
+            try:
+                claimed = self._claim()
+            except sqlite3.Error as e:
+                print(f"Job claim failed: {e}")
+                claimed = None
+            if claimed is None:
+                with self._wake:
+                    self._wake.wait(JOB_POLL_SECONDS)
+                continue
+
+            job_id, payload = claimed
+            with self._wake:
+                self._running.add(job_id)
+
+            def progress(stage, job_id=job_id):
+                self._update(job_id, stage=stage, heartbeat=time.time())
+
+            try:
+                result = self.handler(payload, progress)
+                update = {'state': 'done', 'stage': 'done', 'result': json.dumps(result)}
+            except RetryLater as e:
+                update = self._retry_later(job_id, e)
+            except Exception as e:
+                traceback.print_exc()
+                update = {'state': 'failed', 'stage': 'failed', 'error': str(e)}
+            with self._wake:
+                self._running.discard(job_id)
+            if update['state'] != 'queued':
+                update.update(finished=time.time(), payload=None)
+            self._update(job_id, **update)
+
+    def _retry_later(self, job_id, e):
+        retries = self._connect().execute('SELECT retries FROM jobs WHERE id = ?', (job_id,)).fetchone()[0]
+        if retries >= JOB_MAX_RETRIES:
+            return {'state': 'failed', 'stage': 'failed', 'error': f"Gave up after {retries} retries ({e.stage})"}
+        # The job keeps its (priority, seq), so it goes back to its place in the queue once the delay passes
+        return {'state': 'queued', 'stage': e.stage, 'retries': retries + 1, 'not_before': time.time() + e.delay}
@@ -0,0 +1,57 @@
+"""
+Keyword Matcher Module
+Aho-Corasick automaton for finding many keywords in one pass over a text
+- Same semantics as `keyword in text` for every keyword (plain substring match)
+- Cost is linear in text length, independent of how many keywords are registered
+"""
+
+from collections import deque
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self._goto = [{}]  # state -> {char: next state}
+        self._fail = [0]
+        self._out = [()]  # state -> keywords ending at this state
+        for keyword in dict.fromkeys(keywords):
+            if keyword:
+                self._add(keyword)
+        self._link()
+
+    def _add(self, keyword):
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (keyword,)
+
+    def _link(self):
+        # Breadth-first so every failure target is complete before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text):
+        """Set of registered keywords occurring anywhere in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        hits = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                hits.update(out[state])
+        return hits
@@ -1,11 +1,19 @@
 import yfinance as yf
 from collections import Counter
 import feedparser
-import requests
+import http_client
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
 from datetime import datetime, timedelta
 import time
 import random
 import re
+import hashlib
+from functools import lru_cache
+from keyword_matcher import KeywordMatcher
+from downsample import downsample_indices, encode_compact
+import numpy as np
+import threading
+from singleflight import SingleFlight
 
 # Data Extraction Utilities
 def extract_numbers_from_text(text):
@@ -167,6 +175,106 @@ KEYWORDS = {
     'Bearish': ['plunge', 'drop', 'fall', 'sink', 'loss', 'low', 'miss', 'weak', 'decline', 'negative', 'pessimism', 'bear', 'sell', 'downgrade', 'crash', 'crisis', 'recession', 'inflation', 'fear', 'panic']
 }
 
+# Keyword groups scanned by the hexagon, macro and score-driver builders
+NEWS_TOPICS = {
+    # Coverage filters over title + summary
+    'monetary': ['rate', 'fed', 'ecb', 'boj', 'monetary', 'policy'],
+    'hawkish_tone': ['hike', 'hawkish', 'tighten', 'restrictive'],
+    'dovish_tone': ['cut', 'dovish', 'ease', 'accommodative'],
+    'equity': ['stocks', 'market', 'equity', 'sp500'],
+    'yields': ['yield', 'bond', 'treasury', 'rates'],
+    'growth': ['gdp', 'growth', 'economy', 'recession'],
+    'prices': ['inflation', 'cpi', 'prices', 'cost of living'],
+    'labor': ['jobs', 'unemployment', 'labor', 'hiring'],
+    'currency': ['currency', 'dollar', 'euro', 'yen', 'fx'],
+    'inflation': ['inflation'],
+    'expansion': ['gdp', 'growth', 'expansion', 'recession'],
+    'employment': ['jobs', 'employment', 'unemployment', 'payroll'],
+    'inflation_growth': ['inflation', 'cpi', 'gdp', 'growth', 'recession'],
+    'fx_news': ['dollar', 'euro', 'yen', 'forex', 'fx', 'currency'],
+    'policy_events': ['election', 'government', 'political', 'tariff', 'trade war'],
+    'political': ['election', 'government', 'political', 'tariff', 'trade war', 'sanctions'],
+    'market_coverage': ['market', 'stock', 'rally', 'selloff'],
+    'market': ['market', 'stock', 'rally', 'selloff', 'volatility'],
+    'fiscal': ['debt', 'deficit', 'budget', 'spending', 'fiscal'],
+    'trade_coverage': ['trade', 'sanctions', 'tariff', 'reserves'],
+    'external': ['trade', 'sanctions', 'tariff', 'reserves', 'balance'],
+    # Hexagon score adjustments
+    'dovish_policy': ['rate cut', 'dovish', 'stimulus', 'easing', 'accommodation'],
+    'hawkish_policy': ['rate hike', 'hawkish', 'tightening', 'restrictive'],
+    'inflation_rising': ['rising', 'surge', 'spike'],
+    'inflation_falling': ['falling', 'decline', 'ease'],
+    'fx_inflow': ['export', 'trade surplus'],
+    'fx_outflow': ['import', 'trade deficit'],
+    'fiscal_stress': ['deficit', 'debt crisis'],
+    'fiscal_strength': ['surplus', 'fiscal responsibility'],
+    'trade_conflict': ['sanctions', 'tariff', 'trade war'],
+    'trade_cooperation': ['trade deal', 'cooperation'],
+    # Score drivers over recent headlines
+    'cut_signals': ['cut', 'lower', 'dovish'],
+    'hike_signals': ['hike', 'raise', 'hawkish'],
+    'pause': ['pause', 'hold'],
+    'price_data': ['inflation', 'cpi', 'pce', 'prices'],
+    'price_releases': ['inflation', 'cpi', 'pce'],
+    'growth_releases': ['gdp', 'growth', 'recession'],
+    'labor_market': ['jobs', 'employment', 'unemployment'],
+    'trade_policy': ['tariff', 'trade war', 'sanctions', 'trade'],
+    'elections': ['election', 'vote', 'government'],
+    'geopolitics': ['geopolitical', 'tension', 'conflict', 'war'],
+    'tensions': ['tension', 'conflict'],
+    'regulation': ['regulation', 'policy', 'reform'],
+    'fx_moves': ['dollar', 'euro', 'yen', 'yuan', 'forex', 'fx'],
+    'intervention': ['intervention'],
+    'risk_on': ['rally', 'gain', 'surge', 'rise', 'bull'],
+    'rallies': ['rally', 'surge', 'gain'],
+    'risk_off': ['fall', 'drop', 'plunge', 'decline', 'bear'],
+    'selloffs': ['fall', 'drop', 'decline'],
+    'volatility': ['volatility', 'vix', 'uncertainty'],
+    'debt': ['debt', 'deficit', 'budget'],
+    'stimulus': ['spending', 'stimulus', 'package'],
+    'reserves': ['reserves', 'balance', 'trade'],
+    'sanctions': ['sanctions', 'embargo']
+}
+
+# One automaton over every keyword above, built once at import
+_keyword_matcher = KeywordMatcher(
+    [k for keywords in KEYWORDS.values() for k in keywords] +
+    [k for keywords in NEWS_TOPICS.values() for k in keywords]
+)
+_keyword_categories = {}
+for _cat, _keywords in KEYWORDS.items():
+    for _k in _keywords:
+        _keyword_categories.setdefault(_k, []).append(_cat)
+
+@lru_cache(maxsize=4096)
+def keyword_hits(text):
+    """Every KEYWORDS/NEWS_TOPICS keyword occurring in an already-lowercased text"""
+    return frozenset(_keyword_matcher.find(text))
+
+def _item_hits(item):
+    return keyword_hits((item['title'] + item.get('summary', '')).lower())
+
+def _mentions(hits, topic):
+    return not hits.isdisjoint(NEWS_TOPICS[topic])
+
+def build_news_index(news_items):
+    """Inverted index: keyword -> positions of the items whose title + summary mention it"""
+    index = {}
+    for pos, item in enumerate(news_items):
+        for k in _item_hits(item):
+            index.setdefault(k, []).append(pos)
+    return index
+
+def _items_about(news_items, topic, index):
+    """Items mentioning any keyword of a NEWS_TOPICS group, in list order"""
+    positions = set()
+    for k in NEWS_TOPICS[topic]:
+        positions.update(index.get(k, ()))
+    return [news_items[pos] for pos in sorted(positions)]
+
+def _first_title_about(titles, topic):
+    return [t for t in titles if _mentions(keyword_hits(t.lower()), topic)][0]
+
 # RSS Feeds for additional sources
 RSS_FEEDS = {
     'US': [
@@ -197,12 +305,17 @@ RSS_FEEDS = {
 
 # RSS Feeds - Using Google News for broad, search-based coverage
 # We will generate these dynamically in fetch_rss_news based on the country
-import requests
 
 # RSS Feeds - Using Google News for broad, search-based coverage
 # We will generate these dynamically in fetch_rss_news based on the country
 BASE_RSS_URL = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
 
+# Yahoo ticker news and RSS feeds are downloaded concurrently;
+# whatever hasn't arrived by the deadline is skipped
+NEWS_DEADLINE = 8  # seconds
+NEWS_FETCH_DEADLINE = NEWS_DEADLINE - 1  # Per-request budget, retries included
+_news_pool = ThreadPoolExecutor(max_workers=24, thread_name_prefix='news-fetch')
+
 def clean_html(raw_html):
     cleanr = re.compile('<.*?>')
     cleantext = re.sub(cleanr, '', raw_html)
@@ -215,18 +328,14 @@ def analyze_news_item(title):
     if not title:
         return "General", "Neutral", 0, 0
         
-    title_lower = title.lower()
+    title_hits = keyword_hits(title.lower())
     
     # Determine Category
     scores = {cat: 0 for cat in ['Economy', 'Finance', 'Politics', 'Technology', 'Energy']}
     
-    # Keywords must be defined globally or passed in. Assuming KEYWORDS is global.
-    # We need to make sure KEYWORDS is defined. It is defined in the file.
-    
-    for cat, keywords in KEYWORDS.items():
-        if cat in ['Bullish', 'Bearish']: continue
-        for k in keywords:
-            if k in title_lower:
+    for k in title_hits:
+        for cat in _keyword_categories.get(k, ()):
+            if cat in scores:
                 scores[cat] += 1
                 
     # Default to Finance if related ticker is present (handled in caller), but here we guess
@@ -236,8 +345,8 @@ def analyze_news_item(title):
         
     # Determine Sentiment
     sentiment = "Neutral"
-    bull_score = sum(1 for k in KEYWORDS['Bullish'] if k in title_lower)
-    bear_score = sum(1 for k in KEYWORDS['Bearish'] if k in title_lower)
+    bull_score = sum(1 for k in KEYWORDS['Bullish'] if k in title_hits)
+    bear_score = sum(1 for k in KEYWORDS['Bearish'] if k in title_hits)
     
     sentiment_score = 0 # -1 to 1 scale roughly
     
@@ -462,13 +571,13 @@ def generate_analysis(title, summary, category, sentiment, impact_score):
 
 def fetch_feed_content(url):
     """
-    Fetches RSS feed content using requests with a browser-like User-Agent.
+    Fetches RSS feed content through the shared HTTP session with a browser-like User-Agent.
     """
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     }
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=headers, timeout=10, deadline=NEWS_FETCH_DEADLINE)
         response.raise_for_status()
         return response.content
     except Exception as e:
@@ -488,9 +597,135 @@ def get_google_news_feeds(country_name):
     ]
     return [BASE_RSS_URL.format(query=q.replace(" ", "+")) for q in queries]
 
-def fetch_rss_news(country_code):
+def parse_feed_items(xml_content):
+    """
+    Parses one downloaded RSS feed into raw (not yet analyzed) news items.
+    """
     news_items = []
+    feed = feedparser.parse(xml_content)
+    print(f"RSS Status: {getattr(feed, 'status', 'OK')}, Entries: {len(feed.entries)}")
     
+    # Limit to top 5 per feed to avoid overwhelming but get diversity
+    for entry in feed.entries[:5]: 
+        title = entry.title
+        link = entry.link
+        
+        # Summary extraction
+        summary = ""
+        if hasattr(entry, 'summary'):
+            summary = clean_html(entry.summary)
+        elif hasattr(entry, 'description'):
+            summary = clean_html(entry.description)
+        
+        # Time handling
+        timestamp = time.time()
+        if hasattr(entry, 'published_parsed'):
+            timestamp = time.mktime(entry.published_parsed)
+        elif hasattr(entry, 'updated_parsed'):
+            timestamp = time.mktime(entry.updated_parsed)
+            
+        time_str = datetime.fromtimestamp(timestamp).strftime("%H:%M")
+        
+        publisher = feed.feed.get('title', 'News Source')
+        # Google News often puts source in title "Headline - Source"
+        if " - " in title:
+            parts = title.rsplit(" - ", 1)
+            title = parts[0]
+            publisher = parts[1]
+        
+        news_items.append({
+            'title': title,
+            'link': link,
+            'publisher': publisher,
+            'time': time_str,
+            'timestamp': timestamp,
+            'source_type': 'RSS',
+            'summary': summary
+        })
+    return news_items
+
+def fetch_feed_items(url):
+    """
+    Downloads and parses one RSS feed.
+    """
+    xml_content = fetch_feed_content(url)
+    if not xml_content:
+        print(f"Failed to fetch content for {url}")
+        return []
+    return parse_feed_items(xml_content)
+
+def fetch_yahoo_news(ticker):
+    """
+    Fetches raw (not yet analyzed) Yahoo Finance news items for one ticker.
+    """
+    news_items = []
+    for item in yf.Ticker(ticker).news or []:
+        # New yfinance structure: item['content'] contains the data
+        content = item.get('content', {})
+        if not content:
+            content = item  # Fallback to item itself if no 'content' key
+        
+        title = content.get('title', '')
+        if not title:
+            continue
+        
+        # Summary extraction
+        summary = content.get('summary', '')
+        if not summary:
+            summary = title # Fallback
+        
+        # Date/time handling
+        pub_date = content.get('pubDate', '')
+        timestamp = 0
+        time_str = ""
+        
+        if pub_date:
+            try:
+                parsed_dt = datetime.strptime(pub_date, "%Y-%m-%dT%H:%M:%SZ")
+                timestamp = parsed_dt.timestamp()
+                time_str = parsed_dt.strftime("%H:%M")
+            except (ValueError, AttributeError) as e:
+                # Fallback to current time
+                timestamp = datetime.now().timestamp()
+                time_str = datetime.now().strftime("%H:%M")
+                    
+        link = content.get('clickThroughUrl', {}).get('url', '')
+        if not link:
+            link = content.get('canonicalUrl', {}).get('url', '')
+        if not link:
+            link = f"https://finance.yahoo.com/quote/{ticker}"
+        
+        publisher = content.get('provider', {}).get('displayName', 'Yahoo Finance')
+        
+        news_items.append({
+            'title': title,
+            'link': link,
+            'publisher': publisher,
+            'time': time_str,
+            'timestamp': timestamp,
+            'source_type': 'Yahoo',
+            'summary': summary
+        })
+    return news_items
+
+def analyze_item(item):
+    """
+    Adds category, sentiment, impact and the generated analysis to a raw news item.
+    """
+    category, sentiment, impact, sent_score = analyze_news_item(item['title'])
+    item.update({
+        'category': category,
+        'sentiment': sentiment,
+        'impact': impact,
+        'sentiment_score': sent_score,
+        'analysis': generate_analysis(item['title'], item['summary'], category, sentiment, impact)
+    })
+    return item
+
+def get_country_feeds(country_code):
+    """
+    RSS feeds to query for a country: Google News searches plus any static feeds.
+    """
     # Map code to name for better search queries
     country_names = {
         'US': 'United States',
@@ -511,179 +746,168 @@ def fetch_rss_news(country_code):
     feeds.extend(static_feeds)
     
     # Limit to unique feeds
-    feeds = list(set(feeds))
-    
-    for feed_url in feeds:
-        try:
-            print(f"Fetching RSS: {feed_url}")
-            
-            # Use requests to fetch content first (bypasses 403)
-            xml_content = fetch_feed_content(feed_url)
-            if not xml_content:
-                print(f"Failed to fetch content for {feed_url}")
+    return list(set(feeds))
+
+def _collect_news(jobs, seen_titles):
+    """
+    Runs (label, fn, arg) source fetches concurrently and yields raw items with
+    unseen titles as each source completes. Sources still running at NEWS_DEADLINE are skipped.
+    """
+    futures = {_news_pool.submit(fn, arg): label for label, fn, arg in jobs}
+    try:
+        for future in as_completed(futures, timeout=NEWS_DEADLINE):
+            label = futures[future]
+            try:
+                items = future.result()
+            except Exception as e:
+                print(f"[ERROR] Fetching news from {label}: {e}")
                 continue
-                
-            feed = feedparser.parse(xml_content)
-            print(f"RSS Status: {getattr(feed, 'status', 'OK')}, Entries: {len(feed.entries)}")
-            
-            # Limit to top 5 per feed to avoid overwhelming but get diversity
-            for entry in feed.entries[:5]: 
-                title = entry.title
-                link = entry.link
-                
-                # Summary extraction
-                summary = ""
-                if hasattr(entry, 'summary'):
-                    summary = clean_html(entry.summary)
-                elif hasattr(entry, 'description'):
-                    summary = clean_html(entry.description)
-                
-                # Time handling
-                timestamp = time.time()
-                if hasattr(entry, 'published_parsed'):
-                    timestamp = time.mktime(entry.published_parsed)
-                elif hasattr(entry, 'updated_parsed'):
-                    timestamp = time.mktime(entry.updated_parsed)
-                    
-                time_str = datetime.datetime.fromtimestamp(timestamp).strftime("%H:%M")
-                
-                publisher = feed.feed.get('title', 'News Source')
-                # Google News often puts source in title "Headline - Source"
-                if " - " in title:
-                    parts = title.rsplit(" - ", 1)
-                    title = parts[0]
-                    publisher = parts[1]
-                
-                category, sentiment, impact, sent_score = analyze_news_item(title)
-                analysis = generate_analysis(title, summary, category, sentiment, impact)
-                
-                news_items.append({
-                    'title': title,
-                    'link': link,
-                    'publisher': publisher,
-                    'time': time_str,
-                    'timestamp': timestamp,
-                    'category': category,
-                    'sentiment': sentiment,
-                    'impact': impact,
-                    'sentiment_score': sent_score,
-                    'source_type': 'RSS',
-                    'summary': summary,
-                    'analysis': analysis
-                })
-        except Exception as e:
-            print(f"Error fetching RSS {feed_url}: {e}")
-            continue
-            
+            for item in items:
+                if item['title'] in seen_titles:
+                    continue
+                seen_titles.add(item['title'])
+                yield item
+    except FuturesTimeout:
+        pending = [label for future, label in futures.items() if not future.done()]
+        print(f"News deadline hit, skipping {len(pending)} slow sources: {pending}")
+
+def fetch_rss_news(country_code):
+    news_items = [analyze_item(item) for item in _collect_news(
+        [(url, fetch_feed_items, url) for url in get_country_feeds(country_code)], set()
+    )]
     print(f"Total RSS items fetched: {len(news_items)}")
     return news_items
 
-def get_news(country_code='US'):
+# Per-country news store: analyzed items are kept across refreshes so only new
+# headlines go through analysis, and the assembled response is cached briefly
+NEWS_CACHE_TTL = 120  # seconds an assembled response is served as-is
+NEWS_RETENTION = 3600  # seconds an item stays listed after it was last fetched
+_news_store = {}  # country -> {item_key: (analyzed item, last_seen)}
+_news_responses = {}  # country -> (response, built_at)
+_news_lock = threading.Lock()
+_news_flight = SingleFlight()
+
+# Macro trend payloads: full history is kept in the store, responses carry a downsampled copy
+TREND_POINTS = 500
+TREND_POINTS_MIN = 50
+TREND_POINTS_MAX = 5000
+TREND_FULL_TAIL = 260  # Most recent points (about a trading year) are never downsampled
+
+def shape_trend(trend, points=TREND_POINTS, method='lttb', encoding=None):
+    """
+    Downsamples a {'dates', 'values'} trend to about `points` points.
+    encoding='compact' returns base64 epoch-day int32 / float32 arrays instead of JSON lists.
+    """
+    if not trend or not trend.get('dates'):
+        return trend
+    points = max(TREND_POINTS_MIN, min(int(points), TREND_POINTS_MAX))
+    days = np.array(trend['dates'], dtype='datetime64[D]')
+    values = np.asarray(trend['values'], dtype=np.float64)
+    finite = np.isfinite(values)
+    days, values = days[finite], values[finite]
+    
+    if len(values) > points:
+        tail = min(TREND_FULL_TAIL, points // 2)
+        head = len(values) - tail
+        keep = downsample_indices(days[:head].astype(np.int64), values[:head], points - tail, method)
+        keep = np.concatenate([keep, np.arange(head, len(values))])
+        days, values = days[keep], values[keep]
+    
+    if encoding == 'compact':
+        return encode_compact(days.astype(np.int64), values)
+    return {'dates': np.datetime_as_string(days).tolist(), 'values': values.tolist()}
+
+def shape_trends(response, points=TREND_POINTS, method='lttb', encoding=None):
+    """Copy of a news response with every macro trend passed through shape_trend"""
+    summary = response.get('summary')
+    if not summary or not summary.get('macro_data'):
+        return response
+    macro_data = [dict(item, trend=shape_trend(item.get('trend'), points, method, encoding))
+                  for item in summary['macro_data']]
+    return dict(response, summary=dict(summary, macro_data=macro_data))
+
+def _item_key(item):
+    return hashlib.sha1(f"{item['title']}|{item['link']}".encode('utf-8')).hexdigest()
+
+def get_news(country_code='US', trend_points=TREND_POINTS, trend_method='lttb', trend_encoding=None):
     """
     Fetch news for a specific country/region from Yahoo and RSS.
+    Responses are cached for NEWS_CACHE_TTL; concurrent refreshes of a country share one fetch.
+    Macro trends are downsampled per call (see shape_trend).
     """
-    all_news = []
+    with _news_lock:
+        cached = _news_responses.get(country_code)
+    if cached and time.time() - cached[1] < NEWS_CACHE_TTL:
+        response = cached[0]
+    else:
+        response = _news_flight.do(country_code, _build_news, country_code)
+    return shape_trends(response, trend_points, trend_method, trend_encoding)
+
+def _build_news(country_code):
+    """
+    Fetches all ticker news and RSS feeds concurrently, merging them as they arrive,
+    and analyzes only items the country's store hasn't seen before.
+    """
+    now = time.time()
+    # Unknown codes fall back to Global sources but don't get a store of their own
+    if country_code in COUNTRY_TICKERS:
+        store = _news_store.setdefault(country_code, {})
+    else:
+        store = {}
     seen_titles = set()
+    new_items = 0
     
-    # 1. Fetch Yahoo News
     tickers = COUNTRY_TICKERS.get(country_code, COUNTRY_TICKERS['Global'])
-    for ticker in tickers:
-        try:
-            news_items = yf.Ticker(ticker).news
-            
-            for item in news_items:
-                # New yfinance structure: item['content'] contains the data
-                content = item.get('content', {})
-                if not content:
-                    content = item  # Fallback to item itself if no 'content' key
-                
-                title = content.get('title', '')
-                if not title or title in seen_titles:
-                    continue
-                    
-                seen_titles.add(title)
-                
-                category, sentiment, impact, sent_score = analyze_news_item(title)
-                
-                # Summary extraction
-                summary = content.get('summary', '')
-                if not summary:
-                    summary = title # Fallback
-                
-                analysis = generate_analysis(title, summary, category, sentiment, impact)
-                
-                # Date/time handling
-                pub_date = content.get('pubDate', '')
-                timestamp = 0
-                time_str = ""
-                
-                if pub_date:
-                    try:
-                        from datetime import datetime as dt
-                        parsed_dt = dt.strptime(pub_date, "%Y-%m-%dT%H:%M:%SZ")
-                        timestamp = parsed_dt.timestamp()
-                        time_str = parsed_dt.strftime("%H:%M")
-                    except (ValueError, AttributeError) as e:
-                        # Fallback to current time
-                        from datetime import datetime as dt
-                        timestamp = dt.now().timestamp()
-                        time_str = dt.now().strftime("%H:%M")
-                            
-                link = content.get('clickThroughUrl', {}).get('url', '')
-                if not link:
-                    link = content.get('canonicalUrl', {}).get('url', '')
-                if not link:
-                    link = f"https://finance.yahoo.com/quote/{ticker}"
-                
-                publisher = content.get('provider', {}).get('displayName', 'Yahoo Finance')
-                
-                all_news.append({
-                    'title': title,
-                    'link': link,
-                    'publisher': publisher,
-                    'time': time_str,
-                    'timestamp': timestamp,
-                    'category': category,
-                    'sentiment': sentiment,
-                    'impact': impact,
-                    'sentiment_score': sent_score,
-                    'source_type': 'Yahoo',
-                    'summary': summary,
-                    'analysis': analysis
-                })
-        except Exception as e:
-            print(f"[ERROR] Fetching Yahoo news for {ticker}: {e}")
-            continue
-
-    print(f"[DEBUG] Yahoo news fetched: {len(all_news)} items for {country_code}")
-
-    # 2. Fetch RSS News
-    rss_news = fetch_rss_news(country_code)
-    print(f"[DEBUG] RSS news fetched: {len(rss_news)} items for {country_code}")
+    jobs = [(f"Yahoo {ticker}", fetch_yahoo_news, ticker) for ticker in tickers]
+    jobs += [(url, fetch_feed_items, url) for url in get_country_feeds(country_code)]
+    
+    for item in _collect_news(jobs, seen_titles):
+        key = _item_key(item)
+        entry = store.get(key)
+        if entry is None:
+            analyzed = analyze_item(item)
+            new_items += 1
+        else:
+            analyzed = entry[0]
+        store[key] = (analyzed, now)
+    
+    # Keep recently seen items listed so a slow source doesn't empty the feed
+    for key, (item, last_seen) in list(store.items()):
+        if now - last_seen > NEWS_RETENTION:
+            del store[key]
     
-    for item in rss_news:
+    all_news = []
+    seen_titles = set()
+    for item, _ in store.values():
         if item['title'] not in seen_titles:
             seen_titles.add(item['title'])
             all_news.append(item)
     
+    print(f"[DEBUG] Analyzed {new_items} new news items for {country_code}")
     print(f"[DEBUG] Total news items: {len(all_news)} for {country_code}")
     
     # Sort by timestamp descending
     all_news.sort(key=lambda x: x['timestamp'], reverse=True)
     
     # Generate Summary
-    summary = generate_country_summary(all_news, country_code)
+    # Keyword index shared by every related-news and coverage lookup below
+    index = build_news_index(all_news)
+    summary = generate_country_summary(all_news, country_code, index)
     
     # Generate Hexagon Metrics
-    hexagon_data = generate_hexagon_metrics(all_news, country_code)
+    hexagon_data = generate_hexagon_metrics(all_news, country_code, index)
     
-    return {
+    response = {
         'news': all_news,
         'summary': summary,
         'hexagon': hexagon_data
     }
+    if country_code in COUNTRY_TICKERS:
+        with _news_lock:
+            _news_responses[country_code] = (response, now)
+    return response
 
-def generate_country_summary(news_items, country_code='Global'):
+def generate_country_summary(news_items, country_code='Global', index=None):
     if not news_items:
         return {
             'eco_score': 0,
@@ -764,7 +988,7 @@ def generate_country_summary(news_items, country_code='Global'):
         verdict += f" Key themes include {', '.join(top_topics[:3])}."
         
     # Get Macro Data
-    macro_data = _get_country_macro_data(country_code, news_items)
+    macro_data = _get_country_macro_data(country_code, news_items, index)
         
     return {
         'eco_score': round(eco_score, 1),
@@ -778,11 +1002,13 @@ def generate_country_summary(news_items, country_code='Global'):
         'top_news': news_items[:3] # Top 3 news for the feed
     }
 
-def _get_monetary_data_points(news_items, score):
+def _get_monetary_data_points(news_items, score, index=None):
     """Extract real monetary policy data from news with specific details - INVESTOR GRADE"""
     import re
     from datetime import datetime
     
+    if index is None:
+        index = build_news_index(news_items)
     all_text = ' '.join([item['title'] + ' ' + item.get('summary', '') for item in news_items])
     numbers = extract_numbers_from_text(all_text)
     actions = extract_policy_actions(news_items)
@@ -861,18 +1087,18 @@ def _get_monetary_data_points(news_items, score):
         points.append(f"🏛️ **Institutions**: {cb_list}{' +' + str(len(central_banks)-3) + ' more' if len(central_banks) > 3 else ''}")
     
     # News coverage with sentiment breakdown
-    monetary_mentions = sum(1 for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['rate', 'fed', 'ecb', 'boj', 'monetary', 'policy']))
+    monetary_mentions = len(_items_about(news_items, 'monetary', index))
     if monetary_mentions > 0:
         coverage_pct = (monetary_mentions / len(news_items) * 100) if news_items else 0
-        hawkish_mentions = sum(1 for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['hike', 'hawkish', 'tighten', 'restrictive']))
-        dovish_mentions = sum(1 for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['cut', 'dovish', 'ease', 'accommodative']))
+        hawkish_mentions = len(_items_about(news_items, 'hawkish_tone', index))
+        dovish_mentions = len(_items_about(news_items, 'dovish_tone', index))
         
         sentiment_label = "Hawkish" if hawkish_mentions > dovish_mentions else "Dovish" if dovish_mentions > hawkish_mentions else "Balanced"
         points.append(f"📰 **Media Coverage**: {monetary_mentions} articles ({coverage_pct:.0f}% of total) - {sentiment_label} tone")
     
     return points if points else ['Insufficient monetary policy data from recent news']
 
-def _get_country_macro_data(country_code, news_items=[]):
+def _get_country_macro_data(country_code, news_items=[], index=None):
     """
     Fetch real-time macro indicators for the country outlook.
     Returns a list of dicts with label, value, change, trend_data.
@@ -893,6 +1119,8 @@ def _get_country_macro_data(country_code, news_items=[]):
     country_tickers = tickers.get(country_code, tickers['Global'])
     
     macro_data = []
+    if index is None:
+        index = build_news_index(news_items)
     
     # Helper for deep analysis
     def _get_macro_analysis(indicator, country):
@@ -970,7 +1198,7 @@ def _get_country_macro_data(country_code, news_items=[]):
                     'larger_trend': analysis['larger_trend'],
                     'relevance': analysis['relevance'],
                     'key_drivers': analysis['drivers'],
-                    'related_news': [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['stocks', 'market', 'equity', 'sp500'])][:3]
+                    'related_news': _items_about(news_items, 'equity', index)[:3]
                 }
             })
     except:
@@ -1005,7 +1233,7 @@ def _get_country_macro_data(country_code, news_items=[]):
                         'larger_trend': analysis['larger_trend'],
                         'relevance': analysis['relevance'],
                         'key_drivers': analysis['drivers'],
-                        'related_news': [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['yield', 'bond', 'treasury', 'rates'])][:3]
+                        'related_news': _items_about(news_items, 'yields', index)[:3]
                     }
                 })
     except:
@@ -1056,7 +1284,7 @@ def _get_country_macro_data(country_code, news_items=[]):
             'larger_trend': analysis['larger_trend'],
             'relevance': analysis['relevance'],
             'key_drivers': analysis['drivers'],
-            'related_news': [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['gdp', 'growth', 'economy', 'recession'])][:3]
+            'related_news': _items_about(news_items, 'growth', index)[:3]
         }
     })
     
@@ -1104,7 +1332,7 @@ def _get_country_macro_data(country_code, news_items=[]):
             'larger_trend': analysis['larger_trend'],
             'relevance': analysis['relevance'],
             'key_drivers': analysis['drivers'],
-            'related_news': [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['inflation', 'cpi', 'prices', 'cost of living'])][:3]
+            'related_news': _items_about(news_items, 'prices', index)[:3]
         }
     })
     
@@ -1147,7 +1375,7 @@ def _get_country_macro_data(country_code, news_items=[]):
             'larger_trend': analysis['larger_trend'],
             'relevance': analysis['relevance'],
             'key_drivers': analysis['drivers'],
-            'related_news': [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['jobs', 'unemployment', 'labor', 'hiring'])][:3]
+            'related_news': _items_about(news_items, 'labor', index)[:3]
         }
     })
     
@@ -1182,7 +1410,7 @@ def _get_country_macro_data(country_code, news_items=[]):
                         'larger_trend': analysis['larger_trend'],
                         'relevance': analysis['relevance'],
                         'key_drivers': analysis['drivers'],
-                        'related_news': [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['currency', 'dollar', 'euro', 'yen', 'fx'])][:3]
+                        'related_news': _items_about(news_items, 'currency', index)[:3]
                     }
                 })
     except:
@@ -1190,10 +1418,12 @@ def _get_country_macro_data(country_code, news_items=[]):
 
     return macro_data
 
-def _get_inflation_data_points(news_items, score):
+def _get_inflation_data_points(news_items, score, index=None):
     """Extract real inflation and growth data with specifics - INVESTOR GRADE"""
     import re
     
+    if index is None:
+        index = build_news_index(news_items)
     all_text = ' '.join([item['title'] + ' ' + item.get('summary', '') for item in news_items])
     numbers = extract_numbers_from_text(all_text)
     
@@ -1294,9 +1524,9 @@ def _get_inflation_data_points(news_items, score):
         points.append("🔴 **Outlook**: Severe contraction/recession risk")
     
     # News coverage breakdown with thematic analysis
-    inflation_mentions = sum(1 for item in news_items if 'inflation' in (item['title'] + item.get('summary', '')).lower())
-    growth_mentions = sum(1 for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['gdp', 'growth', 'expansion', 'recession']))
-    employment_mentions = sum(1 for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['jobs', 'employment', 'unemployment', 'payroll']))
+    inflation_mentions = len(_items_about(news_items, 'inflation', index))
+    growth_mentions = len(_items_about(news_items, 'expansion', index))
+    employment_mentions = len(_items_about(news_items, 'employment', index))
     
     if inflation_mentions + growth_mentions + employment_mentions > 0:
         total_econ = inflation_mentions + growth_mentions + employment_mentions
@@ -1315,70 +1545,70 @@ def _generate_score_drivers(news_items, score, metric_name):
     
     # Extract key themes from titles
     titles = [item['title'] for item in news_items[:5]]
-    all_text = ' '.join(titles).lower()
+    hits = keyword_hits(' '.join(titles).lower())
     
     # Common patterns that drive scores WITH specific examples
     if metric_name == 'Monetary Policy':
-        if 'cut' in all_text or 'lower' in all_text or 'dovish' in all_text:
-            example = [t for t in titles if any(kw in t.lower() for kw in ['cut', 'lower', 'dovish'])][0] if titles else "rate cut"
+        if _mentions(hits, 'cut_signals'):
+            example = _first_title_about(titles, 'cut_signals') if titles else "rate cut"
             drivers.append(f"📉 **Rate cut signals** detected (e.g., \"{example[:60]}...\")")
-        if 'hike' in all_text or 'raise' in all_text or 'hawkish' in all_text:
-            example = [t for t in titles if any(kw in t.lower() for kw in ['hike', 'raise', 'hawkish'])][0] if titles else "rate hike"
+        if _mentions(hits, 'hike_signals'):
+            example = _first_title_about(titles, 'hike_signals') if titles else "rate hike"
             drivers.append(f"📈 **Rate hike expectations** (e.g., \"{example[:60]}...\")")
-        if 'pause' in all_text or 'hold' in all_text:
+        if _mentions(hits, 'pause'):
             drivers.append("⏸️ **Policy pause** or wait-and-see stance indicated")
-        if 'inflation' in all_text:
+        if 'inflation' in hits:
             drivers.append("💹 **Inflation data** influencing policy trajectory")
     
     elif metric_name == 'Inflation & Growth':
-        if any(word in all_text for word in ['inflation', 'cpi', 'pce', 'prices']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['inflation', 'cpi', 'pce'])][0] if titles else "inflation"
+        if _mentions(hits, 'price_data'):
+            example = _first_title_about(titles, 'price_releases') if titles else "inflation"
             drivers.append(f"📊 **Inflation data releases** (e.g., \"{example[:60]}...\")")
-        if any(word in all_text for word in ['gdp', 'growth', 'expansion', 'recession']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['gdp', 'growth', 'recession'])][0] if titles else "growth"
+        if _mentions(hits, 'expansion'):
+            example = _first_title_about(titles, 'growth_releases') if titles else "growth"
             drivers.append(f"📈 **Economic growth updates** (e.g., \"{example[:60]}...\")")
-        if 'jobs' in all_text or 'employment' in all_text or 'unemployment' in all_text:
+        if _mentions(hits, 'labor_market'):
             drivers.append("👥 **Labor market** developments affecting outlook")
     
     elif metric_name == 'Political Risk':
-        if any(word in all_text for word in ['tariff', 'trade war', 'sanctions', 'trade']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['tariff', 'trade war', 'sanctions'])][0] if titles else "trade"
+        if _mentions(hits, 'trade_policy'):
+            example = _first_title_about(titles, 'trade_conflict') if titles else "trade"
             drivers.append(f"🌐 **Trade policy developments** (e.g., \"{example[:60]}...\")")
-        if any(word in all_text for word in ['election', 'vote', 'government']):
+        if _mentions(hits, 'elections'):
             drivers.append("🗳️ **Political events** and electoral developments")
-        if any(word in all_text for word in ['geopolitical', 'tension', 'conflict', 'war']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['tension', 'conflict'])][0] if titles else "geopolitics"
+        if _mentions(hits, 'geopolitics'):
+            example = _first_title_about(titles, 'tensions') if titles else "geopolitics"
             drivers.append(f"⚠️ **Geopolitical tensions** (e.g., \"{example[:60]}...\")")
-        if any(word in all_text for word in ['regulation', 'policy', 'reform']):
+        if _mentions(hits, 'regulation'):
             drivers.append("📜 **Regulatory changes** affecting business environment")
     
     elif metric_name == 'Currency Strength':
-        if any(word in all_text for word in ['dollar', 'euro', 'yen', 'yuan', 'forex', 'fx']):
+        if _mentions(hits, 'fx_moves'):
             drivers.append("💱 **FX market movements** impacting competitiveness")
-        if 'intervention' in all_text:
+        if 'intervention' in hits:
             drivers.append("🏦 **Central bank intervention** actions in currency markets")
     
     elif metric_name == 'Investor Sentiment':
-        if any(word in all_text for word in ['rally', 'gain', 'surge', 'rise', 'bull']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['rally', 'surge', 'gain'])][0] if titles else "rally"
+        if _mentions(hits, 'risk_on'):
+            example = _first_title_about(titles, 'rallies') if titles else "rally"
             drivers.append(f"📈 **Risk-on sentiment** (e.g., \"{example[:60]}...\")")
-        if any(word in all_text for word in ['fall', 'drop', 'plunge', 'decline', 'bear']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['fall', 'drop', 'decline'])][0] if titles else "selloff"
+        if _mentions(hits, 'risk_off'):
+            example = _first_title_about(titles, 'selloffs') if titles else "selloff"
             drivers.append(f"📉 **Market selloffs** (e.g., \"{example[:60]}...\")")
-        if any(word in all_text for word in ['volatility', 'vix', 'uncertainty']):
+        if _mentions(hits, 'volatility'):
             drivers.append("📊 **Elevated volatility** and uncertainty")
     
     elif metric_name == 'Fiscal Health':
-        if any(word in all_text for word in ['debt', 'deficit', 'budget']):
+        if _mentions(hits, 'debt'):
             drivers.append("💰 **Debt/deficit concerns** shaping fiscal outlook")
-        if any(word in all_text for word in ['spending', 'stimulus', 'package']):
+        if _mentions(hits, 'stimulus'):
             drivers.append("💵 **Fiscal stimulus** programs proposed/enacted")
     
     elif metric_name == 'External Vulnerability':
-        if any(word in all_text for word in ['reserves', 'balance', 'trade']):
+        if _mentions(hits, 'reserves'):
             drivers.append("📊 **Trade balance** and reserve levels monitored")
-        if any(word in all_text for word in ['sanctions', 'embargo']):
-            example = [t for t in titles if any(kw in t.lower() for kw in ['sanctions', 'embargo'])][0] if titles else "sanctions"
+        if _mentions(hits, 'sanctions'):
+            example = _first_title_about(titles, 'sanctions') if titles else "sanctions"
             drivers.append(f"🚫 **Sanctions/restrictions** (e.g., \"{example[:60]}...\")")
     
     # Add headline count
@@ -1402,7 +1632,7 @@ def _generate_score_drivers(news_items, score, metric_name):
     return drivers
 
 
-def generate_hexagon_metrics(news_items, country_code='Global'):
+def generate_hexagon_metrics(news_items, country_code='Global', index=None):
     """
     Generates 7 hexagon metrics (0-100 scale) for macro dashboard.
     Returns data for center + 6 surrounding hexagons.
@@ -1452,6 +1682,9 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
             ]
         }
     
+    if index is None:
+        index = build_news_index(news_items)
+    
     # Analyze news for each metric
     monetary_score = 50
     inflation_score = 50
@@ -1462,29 +1695,26 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
     external_score = 50
     
     # Monetary Policy: Higher score = dovish (good for risk), lower = hawkish
-    monetary_keywords = ['rate cut', 'dovish', 'stimulus', 'easing', 'accommodation']
-    hawkish_keywords = ['rate hike', 'hawkish', 'tightening', 'restrictive']
-    
     for item in news_items:
-        text = (item['title'] + ' ' + item.get('summary', '')).lower()
+        hits = keyword_hits((item['title'] + ' ' + item.get('summary', '')).lower())
         
         # Monetary Policy
-        if any(kw in text for kw in monetary_keywords):
+        if _mentions(hits, 'dovish_policy'):
             monetary_score += 5
-        if any(kw in text for kw in hawkish_keywords):
+        if _mentions(hits, 'hawkish_policy'):
             monetary_score -= 5
             
         # Inflation (lower is better)
-        if 'inflation' in text:
-            if 'rising' in text or 'surge' in text or 'spike' in text:
+        if 'inflation' in hits:
+            if _mentions(hits, 'inflation_rising'):
                 inflation_score -= 4
-            elif 'falling' in text or 'decline' in text or 'ease' in text:
+            elif _mentions(hits, 'inflation_falling'):
                 inflation_score += 4
                 
         # Currency (strength from trade/export news)
-        if 'export' in text or 'trade surplus' in text:
+        if _mentions(hits, 'fx_inflow'):
             currency_score += 3
-        if 'import' in text or 'trade deficit' in text:
+        if _mentions(hits, 'fx_outflow'):
             currency_score -= 3
             
         # Political Risk (stability vs chaos)
@@ -1501,15 +1731,15 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
             sentiment_score -= 2
             
         # Fiscal Health (debt/deficit keywords)
-        if 'deficit' in text or 'debt crisis' in text:
+        if _mentions(hits, 'fiscal_stress'):
             fiscal_score -= 3
-        if 'surplus' in text or 'fiscal responsibility' in text:
+        if _mentions(hits, 'fiscal_strength'):
             fiscal_score += 3
             
         # External Vulnerability (trade wars, sanctions)
-        if 'sanctions' in text or 'tariff' in text or 'trade war' in text:
+        if _mentions(hits, 'trade_conflict'):
             external_score -= 4
-        if 'trade deal' in text or 'cooperation' in text:
+        if _mentions(hits, 'trade_cooperation'):
             external_score += 4
     
     # Clamp scores to 0-100
@@ -1580,13 +1810,13 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                 'breakdown': {
                     'description': 'Central bank policy stance affecting liquidity and borrowing costs.',
                     'market_implications': generate_contextual_insight('Monetary Policy', monetary_score, news_items, country_code),
-                    'data_points': _get_monetary_data_points(news_items, monetary_score),
+                    'data_points': _get_monetary_data_points(news_items, monetary_score, index),
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['rate', 'fed', 'ecb', 'boj', 'monetary', 'policy'])][:3],
+                        _items_about(news_items, 'monetary', index)[:3],
                         monetary_score, 'Monetary Policy'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['rate', 'fed', 'ecb', 'boj', 'monetary', 'policy'])][:3]]
+                                    for item in _items_about(news_items, 'monetary', index)[:3]]
                 }
             },
             {
@@ -1597,13 +1827,13 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                 'breakdown': {
                     'description': 'Assesses economic growth momentum, inflation trajectory, and stagflation risk through GDP, CPI, and employment data.',
                     'market_implications': generate_contextual_insight('Inflation & Growth', inflation_score, news_items, country_code),
-                    'data_points': _get_inflation_data_points(news_items, inflation_score),
+                    'data_points': _get_inflation_data_points(news_items, inflation_score, index),
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['inflation', 'cpi', 'gdp', 'growth', 'recession'])][:3],
+                        _items_about(news_items, 'inflation_growth', index)[:3],
                         inflation_score, 'Inflation & Growth'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['inflation', 'cpi', 'gdp', 'growth', 'recession'])][:3]]
+                                    for item in _items_about(news_items, 'inflation_growth', index)[:3]]
                 }
             },
             {
@@ -1616,14 +1846,14 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                     'market_implications': generate_contextual_insight('Currency Strength', currency_score, news_items, country_code),
                     'data_points': [
                         f"FX Sentiment: {'Strong' if currency_score > 60 else 'Weak' if currency_score < 40 else 'Stable'}",
-                        f"Currency News Coverage: {len([item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['dollar', 'euro', 'yen', 'forex', 'fx', 'currency'])])} mentions"
+                        f"Currency News Coverage: {len(_items_about(news_items, 'fx_news', index))} mentions"
                     ],
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['dollar', 'euro', 'yen', 'forex', 'fx', 'currency'])][:3],
+                        _items_about(news_items, 'fx_news', index)[:3],
                         currency_score, 'Currency Strength'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['dollar', 'euro', 'yen', 'forex', 'fx', 'currency'])][:3]]
+                                    for item in _items_about(news_items, 'fx_news', index)[:3]]
                 }
             },
             {
@@ -1636,14 +1866,14 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                     'market_implications': generate_contextual_insight('Political Risk', political_score, news_items, country_code),
                     'data_points': [
                         f"Political Stability: {'High' if political_score > 60 else 'Moderate' if political_score > 40 else 'Elevated Risk'}",
-                        f"Policy Events Tracked: {len([item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['election', 'government', 'political', 'tariff', 'trade war'])])} developments"
+                        f"Policy Events Tracked: {len(_items_about(news_items, 'policy_events', index))} developments"
                     ],
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['election', 'government', 'political', 'tariff', 'trade war', 'sanctions'])][:3],
+                        _items_about(news_items, 'political', index)[:3],
                         political_score, 'Political Risk'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['election', 'government', 'political', 'tariff', 'trade war', 'sanctions'])][:3]]
+                                    for item in _items_about(news_items, 'political', index)[:3]]
                 }
             },
             {
@@ -1656,14 +1886,14 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                     'market_implications': generate_contextual_insight('Investor Sentiment', sentiment_score, news_items, country_code),
                     'data_points': [
                         f"Risk Appetite: {'Risk-On' if sentiment_score > 60 else 'Risk-Off' if sentiment_score < 40 else 'Neutral'}",
-                        f"Market Sentiment Coverage: {len([item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['market', 'stock', 'rally', 'selloff'])])} articles"
+                        f"Market Sentiment Coverage: {len(_items_about(news_items, 'market_coverage', index))} articles"
                     ],
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['market', 'stock', 'rally', 'selloff', 'volatility'])][:3],
+                        _items_about(news_items, 'market', index)[:3],
                         sentiment_score, 'Investor Sentiment'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['market', 'stock', 'rally', 'selloff', 'volatility'])][:3]]
+                                    for item in _items_about(news_items, 'market', index)[:3]]
                 }
             },
             {
@@ -1676,14 +1906,14 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                     'market_implications': generate_contextual_insight('Fiscal Health', fiscal_score, news_items, country_code),
                     'data_points': [
                         f"Fiscal Condition: {'Strong' if fiscal_score > 60 else 'Concerning' if fiscal_score < 40 else 'Moderate'}",
-                        f"Fiscal Policy News: {len([item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['debt', 'deficit', 'budget', 'spending', 'fiscal'])])} mentions"
+                        f"Fiscal Policy News: {len(_items_about(news_items, 'fiscal', index))} mentions"
                     ],
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['debt', 'deficit', 'budget', 'spending', 'fiscal'])][:3],
+                        _items_about(news_items, 'fiscal', index)[:3],
                         fiscal_score, 'Fiscal Health'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['debt', 'deficit', 'budget', 'spending', 'fiscal'])][:3]]
+                                    for item in _items_about(news_items, 'fiscal', index)[:3]]
                 }
             },
             {
@@ -1696,14 +1926,14 @@ def generate_hexagon_metrics(news_items, country_code='Global'):
                     'market_implications': generate_contextual_insight('External Vulnerability', external_score, news_items, country_code),
                     'data_points': [
                         f"External Risk: {'Low' if external_score > 60 else 'High' if external_score < 40 else 'Moderate'}",
-                        f"Trade/Sanction News: {len([item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['trade', 'sanctions', 'tariff', 'reserves'])])} events"
+                        f"Trade/Sanction News: {len(_items_about(news_items, 'trade_coverage', index))} events"
                     ],
                     'score_drivers': _generate_score_drivers(
-                        [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['trade', 'sanctions', 'tariff', 'reserves', 'balance'])][:3],
+                        _items_about(news_items, 'external', index)[:3],
                         external_score, 'External Vulnerability'
                     ),
                     'top_sources': [{'title': item['title'], 'url': item.get('link', ''), 'publisher': item.get('publisher', 'Unknown')} 
-                                    for item in [item for item in news_items if any(kw in (item['title'] + item.get('summary', '')).lower() for kw in ['trade', 'sanctions', 'tariff', 'reserves', 'balance'])][:3]]
+                                    for item in _items_about(news_items, 'external', index)[:3]]
                 }
             }
         ]
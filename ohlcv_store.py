@@ -0,0 +1,319 @@
+"""
+OHLCV Store Module
+Persistent on-disk bar cache for get_data
+- One columnar NumPy archive per ticker/interval (timestamps + OHLCV columns)
+- Historical bars are served locally; only the tail since the last stored bar is downloaded
+- Falls back to the stored bars when the tail refresh fails (e.g. Yahoo is slow or throttling)
+"""
+
+import os
+import threading
+import time
+from contextlib import ExitStack
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+STORE_DIR = os.getenv('OHLCV_STORE_DIR', os.path.join('data_cache', 'ohlcv'))
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+MAX_HISTORY = -1  # covers_from marker for a period='max' download
+
+# Calendar lookback per yfinance period; 'Nd' periods are counted in trading days instead
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+TRADING_DAY_PERIODS = {'1d': 1, '5d': 5}
+
+# Yahoo only serves recent history for intraday bars; larger gaps need a full download
+INTRADAY_TAIL_LIMIT = pd.Timedelta(days=7)
+
+# Bars are split/dividend adjusted; a re-fetched bar differing by more than this means history was rebased
+ADJUSTMENT_TOLERANCE = 5e-4
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+def _lock_for(path):
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+def _is_intraday(interval):
+    return (interval.endswith('m') and not interval.endswith('mo')) or interval.endswith('h')
+
+def refresh_after(interval):
+    """Seconds before stored bars are topped up with a tail fetch"""
+    if interval.endswith('m') and not interval.endswith('mo'):
+        return 60
+    if interval.endswith('h'):
+        return 300
+    return 900
+
+def is_supported_period(period):
+    return period == 'max' or period == 'ytd' or period in PERIOD_OFFSETS or period in TRADING_DAY_PERIODS
+
+def _store_path(ticker, interval):
+    return os.path.join(STORE_DIR, f"{quote(ticker, safe='')}_{interval}.npz")
+
+def _period_cutoff(period, now):
+    """First UTC timestamp (ns) a calendar period needs, or MAX_HISTORY"""
+    if period == 'max':
+        return MAX_HISTORY
+    if period == 'ytd':
+        return pd.Timestamp(year=now.year, month=1, day=1, tz='UTC').value
+    if period in PERIOD_OFFSETS:
+        return (now - PERIOD_OFFSETS[period]).value
+    # Trading-day periods: allow for weekends and holidays around the last N sessions
+    return (now - pd.Timedelta(days=TRADING_DAY_PERIODS[period] + 4)).value
+
+def _covers(covers_from, cutoff):
+    if covers_from == MAX_HISTORY:
+        return True
+    return cutoff != MAX_HISTORY and covers_from <= cutoff
+
+def load(ticker, interval):
+    """Return (df, meta) for the stored bars, or (None, None)"""
+    path = _store_path(ticker, interval)
+    if not os.path.exists(path):
+        return None, None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            index = pd.to_datetime(data['ts'], utc=True)
+            tz = str(data['tz'])
+            if tz:
+                index = index.tz_convert(tz)
+            else:
+                index = index.tz_localize(None)
+            df = pd.DataFrame({col: data[col] for col in COLUMNS}, index=index)
+            df.index.name = 'Date'
+            meta = {
+                'covers_from': int(data['covers_from']),
+                'fetched_at': float(data['fetched_at'])
+            }
+        return df, meta
+    except Exception as e:
+        print(f"OHLCV store read error for {ticker} {interval}: {e}")
+        return None, None
+
+def save(ticker, interval, df, covers_from, fetched_at=None):
+    """Atomically write bars for ticker/interval"""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = _store_path(ticker, interval)
+    index = pd.DatetimeIndex(df.index)
+    tz = str(index.tz) if index.tz is not None else ''
+    # Stored as nanoseconds regardless of the index's resolution (pandas 3 defaults to microseconds)
+    ts = (index.tz_convert('UTC') if index.tz is not None else index).as_unit('ns').asi8
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f,
+                ts=ts,
+                tz=np.array(tz),
+                covers_from=np.array(covers_from, dtype=np.int64),
+                fetched_at=np.array(fetched_at if fetched_at is not None else time.time()),
+                **{col: df[col].to_numpy(dtype=np.float64) for col in COLUMNS}
+            )
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"OHLCV store write error for {ticker} {interval}: {e}")
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def merge(stored, fresh):
+    """Combine bar frames, letting fresh bars replace stored ones at the same timestamp"""
+    if stored is None or stored.empty:
+        return fresh
+    if fresh is None or fresh.empty:
+        return stored
+    if (stored.index.tz is None) != (fresh.index.tz is None):
+        # Align a tz-naive side to the other before concatenating
+        if stored.index.tz is None:
+            stored = stored.tz_localize(fresh.index.tz)
+        else:
+            fresh = fresh.tz_localize(stored.index.tz)
+    combined = pd.concat([stored[COLUMNS], fresh[COLUMNS]])
+    combined = combined[~combined.index.duplicated(keep='last')]
+    return combined.sort_index()
+
+def _slice(df, period, cutoff):
+    if period in TRADING_DAY_PERIODS:
+        days = pd.Index(df.index.normalize()).unique()[-TRADING_DAY_PERIODS[period]:]
+        return df[df.index.normalize().isin(days)].copy()
+    if cutoff == MAX_HISTORY:
+        return df.copy()
+    index = df.index if df.index.tz is not None else df.index.tz_localize('UTC')
+    return df[index.as_unit('ns').asi8 >= cutoff].copy()
+
+def _load_current(ticker, interval, now):
+    """Stored bars that can still be extended with a tail fetch, or (None, None)"""
+    stored, meta = load(ticker, interval)
+    if stored is None or stored.empty:
+        return None, None
+    if _is_intraday(interval):
+        last_ts = stored.index[-1]
+        gap = now - (last_ts.tz_convert('UTC') if last_ts.tz is not None else last_ts.tz_localize('UTC'))
+        if gap > INTRADAY_TAIL_LIMIT:
+            # Yahoo cannot bridge the gap; start the store over from a full download
+            return None, None
+    return stored, meta
+
+def _plan(stored, meta, cutoff, interval):
+    """'local' when stored bars are fresh, 'tail' when they need topping up, 'full' otherwise"""
+    if stored is None or not _covers(meta['covers_from'], cutoff):
+        return 'full'
+    if time.time() - meta['fetched_at'] < refresh_after(interval):
+        return 'local'
+    return 'tail'
+
+def _reference_bar(stored):
+    # The last stored bar may still be forming, so the one before it is the last settled bar
+    return stored.index[-2] if len(stored) > 1 else stored.index[-1]
+
+def _tail_start(stored):
+    # Re-fetch from the day of the last settled bar: the partial bar gets replaced and the
+    # settled one is the overlap used to detect adjustment changes
+    return _reference_bar(stored).strftime('%Y-%m-%d')
+
+def _rebased(stored, tail):
+    """
+    True when Yahoo's adjusted prices have moved since the bars were stored (a split or dividend),
+    in which case the tail is on a different price basis and the store must be reloaded.
+    """
+    if isinstance(tail, Exception) or tail is None or tail.empty:
+        return False
+    ref = _reference_bar(stored)
+    try:
+        fresh_close = tail.loc[ref, 'Close']
+    except (KeyError, TypeError):
+        return False
+    if isinstance(fresh_close, pd.Series):
+        fresh_close = fresh_close.iloc[-1]
+    return not np.isclose(fresh_close, stored.loc[ref, 'Close'], rtol=ADJUSTMENT_TOLERANCE)
+
+def _apply_tail(ticker, interval, stored, meta, tail, period, cutoff):
+    if isinstance(tail, ValueError):
+        tail = None  # No new bars yet
+    elif isinstance(tail, Exception):
+        print(f"OHLCV tail refresh failed for {ticker} {interval}, serving stored bars: {tail}")
+        return _slice(stored, period, cutoff)
+    else:
+        print(f"DEBUG: OHLCV store tail refresh for {ticker} {interval}: {len(tail)} bars")
+    merged = merge(stored, tail)
+    save(ticker, interval, merged, meta['covers_from'])
+    return _slice(merged, period, cutoff)
+
+def _apply_full(ticker, interval, stored, meta, fresh, period, cutoff):
+    covers_from = cutoff
+    if meta is not None and _covers(meta['covers_from'], covers_from):
+        covers_from = meta['covers_from']
+    merged = merge(stored, fresh)
+    save(ticker, interval, merged, covers_from)
+    return _slice(merged, period, cutoff)
+
+def get_bars(ticker, period, interval, download):
+    """
+    Serve bars for ticker/period/interval from the store, downloading only what is missing.
+    download(period=...) or download(start=...) must return a cleaned OHLCV DataFrame
+    and raise ValueError when Yahoo has no bars for the request.
+    """
+    now = pd.Timestamp.now(tz='UTC')
+    cutoff = _period_cutoff(period, now)
+    path = _store_path(ticker, interval)
+
+    with _lock_for(path):
+        stored, meta = _load_current(ticker, interval, now)
+        plan = _plan(stored, meta, cutoff, interval)
+
+        if plan == 'local':
+            return _slice(stored, period, cutoff)
+
+        if plan == 'tail':
+            try:
+                tail = download(start=_tail_start(stored))
+            except Exception as e:
+                tail = e
+            if not _rebased(stored, tail):
+                return _apply_tail(ticker, interval, stored, meta, tail, period, cutoff)
+            print(f"OHLCV store: adjusted prices changed for {ticker} {interval}, reloading")
+            try:
+                fresh = download(period=period)
+            except Exception as e:
+                # Stale but self-consistent bars beat no chart
+                print(f"OHLCV reload failed for {ticker} {interval}, serving stored bars: {e}")
+                return _slice(stored, period, cutoff)
+            # Stored history is on the old price basis; replace it rather than merge
+            return _apply_full(ticker, interval, None, None, fresh, period, cutoff)
+
+        fresh = download(period=period)
+        return _apply_full(ticker, interval, stored, meta, fresh, period, cutoff)
+
+def get_bars_batch(tickers, period, interval, download_batch):
+    """
+    Batched get_bars for tickers sharing a period/interval.
+    download_batch(tickers, period=...) or download_batch(tickers, start=...) must return
+    {ticker: DataFrame or Exception}. At most one tail and one full download are issued.
+    Returns {ticker: DataFrame or Exception}.
+    """
+    # Same per-file locks as get_bars, taken in sorted order so concurrent batches can't deadlock
+    with ExitStack() as stack:
+        for path in sorted({_store_path(ticker, interval) for ticker in tickers}):
+            stack.enter_context(_lock_for(path))
+        return _get_bars_batch_locked(tickers, period, interval, download_batch)
+
+def _get_bars_batch_locked(tickers, period, interval, download_batch):
+    now = pd.Timestamp.now(tz='UTC')
+    cutoff = _period_cutoff(period, now)
+    results = {}
+    tails = {}
+    fulls = {}
+    rebased = {}  # ticker -> old stored bars, served if the reload fails
+
+    for ticker in tickers:
+        stored, meta = _load_current(ticker, interval, now)
+        plan = _plan(stored, meta, cutoff, interval)
+        if plan == 'local':
+            results[ticker] = _slice(stored, period, cutoff)
+        elif plan == 'tail':
+            tails[ticker] = (stored, meta)
+        else:
+            fulls[ticker] = (stored, meta)
+
+    if tails:
+        # One download from the earliest stored tail; merging dedupes the overlap for the others
+        start = min(_tail_start(stored) for stored, _ in tails.values())
+        try:
+            fetched = download_batch(list(tails), start=start)
+        except Exception as e:
+            fetched = {ticker: e for ticker in tails}
+        for ticker, (stored, meta) in tails.items():
+            tail = fetched.get(ticker, ValueError(f"No data returned for {ticker}"))
+            if _rebased(stored, tail):
+                # Stored history is on the old price basis; replace it rather than merge
+                print(f"OHLCV store: adjusted prices changed for {ticker} {interval}, reloading")
+                fulls[ticker] = (None, None)
+                rebased[ticker] = stored
+            else:
+                results[ticker] = _apply_tail(ticker, interval, stored, meta, tail, period, cutoff)
+
+    if fulls:
+        try:
+            fetched = download_batch(list(fulls), period=period)
+        except Exception as e:
+            fetched = {ticker: e for ticker in fulls}
+        for ticker, (stored, meta) in fulls.items():
+            fresh = fetched.get(ticker, ValueError(f"No data returned for {ticker}"))
+            if isinstance(fresh, Exception) and ticker in rebased:
+                results[ticker] = _slice(rebased[ticker], period, cutoff)
+            elif isinstance(fresh, Exception):
+                results[ticker] = fresh
+            else:
+                results[ticker] = _apply_full(ticker, interval, stored, meta, fresh, period, cutoff)
+
+    return results
@@ -5,7 +5,7 @@ Fetches cryptocurrency on-chain metrics using free APIs
 - Calculates TOTAL2, TOTAL3, and other derived metrics
 """
 
-import requests
+import http_client
 import pandas as pd
 from datetime import datetime, timedelta
 import time
@@ -28,7 +28,7 @@ def _get_cached(url, params=None):
             return data
     
     # Make API call
-    response = requests.get(url, params=params, timeout=10)
+    response = http_client.get(url, params=params, timeout=10)
     response.raise_for_status()
     data = response.json()
     
@@ -108,7 +108,7 @@ def get_historical_dominance(days=90):
         # Get BTC market cap history
         btc_url = f"{COINGECKO_BASE}/coins/bitcoin/market_chart"
         btc_params = {'vs_currency': 'usd', 'days': days}
-        btc_response = requests.get(btc_url, params=btc_params, timeout=10)
+        btc_response = http_client.get(btc_url, params=btc_params, timeout=10)
         btc_response.raise_for_status()
         btc_data = btc_response.json()
         
@@ -167,7 +167,7 @@ def get_onchain_metric_data(ticker, period='90d'):
             # Bitcoin Dominance - calculate from BTC market cap vs total
             btc_url = f"{COINGECKO_BASE}/coins/bitcoin/market_chart"
             btc_params = {'vs_currency': 'usd', 'days': days}
-            btc_response = requests.get(btc_url, params=btc_params, timeout=10)
+            btc_response = http_client.get(btc_url, params=btc_params, timeout=10)
             btc_response.raise_for_status()
             btc_data = btc_response.json()
             
@@ -319,7 +319,7 @@ def get_onchain_metric_data(ticker, period='90d'):
             # Use inverse of BTC dominance as proxy
             btc_url = f"{COINGECKO_BASE}/coins/bitcoin/market_chart"
             btc_params = {'vs_currency': 'usd', 'days': days}
-            btc_response = requests.get(btc_url, params=btc_params, timeout=10)
+            btc_response = http_client.get(btc_url, params=btc_params, timeout=10)
             btc_response.raise_for_status()
             btc_data = btc_response.json()
             
@@ -0,0 +1,151 @@
+"""
+Quote Stream Module
+Live ticker quotes shared by every connected client
+- One background loop refreshes all subscribed tickers with a single batched yfinance download
+- Each subscriber receives only the quotes that changed, coalesced if it falls behind
+- Upstream load scales with the number of distinct tickers, not clients x tickers x poll rate
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import yfinance as yf
+
+QUOTE_REFRESH_SECONDS = int(os.getenv('QUOTE_REFRESH_SECONDS', '15'))
+QUOTE_KEEPALIVE_SECONDS = 20
+
+_currencies = {}  # ticker -> currency; only successful lookups are kept
+_currency_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='quote-currency')
+
+def _currency(ticker):
+    """Currency for ticker, or None if the lookup failed (not cached, so it is retried next refresh)"""
+    try:
+        currency = yf.Ticker(ticker).fast_info['currency']
+    except Exception as e:
+        print(f"Currency lookup failed for {ticker}: {e}")
+        return None
+    # Currency never changes, so it costs one lookup per ticker for the life of the process
+    _currencies[ticker] = currency or 'USD'
+    return _currencies[ticker]
+
+def fetch_quotes(tickers):
+    """Current price, currency and daily change for several tickers from one batched download"""
+    # Look up unknown currencies concurrently, while the download runs
+    lookups = {t: _currency_pool.submit(_currency, t) for t in tickers if t not in _currencies}
+    raw = yf.download(list(tickers), period='5d', interval='1d', group_by='ticker', threads=True, progress=False)
+    currencies = {t: future.result() for t, future in lookups.items()}
+    if raw is None or raw.empty:
+        return {}
+
+    now = datetime.now().strftime("%H:%M")
+    quotes = {}
+    for ticker in tickers:
+        try:
+            df = raw[ticker] if isinstance(raw.columns, pd.MultiIndex) else raw
+            closes = df['Close'].dropna()
+        except KeyError:
+            continue
+        if closes.empty:
+            continue
+        current_price = float(closes.iloc[-1])
+        prev_close = float(closes.iloc[-2]) if len(closes) > 1 else current_price
+        quotes[ticker] = {
+            "ticker": ticker,
+            "price": f"{current_price:.2f}",
+            "currency": _currencies.get(ticker) or currencies.get(ticker) or 'USD',
+            "change_pct": ((current_price - prev_close) / prev_close) * 100 if prev_close else 0.0,
+            "time": now
+        }
+    return quotes
+
+def _changed(old, new):
+    # The time field moves every minute; only price movements (or a corrected currency) are worth pushing
+    fields = ('price', 'change_pct', 'currency')
+    return old is None or any(old[f] != new[f] for f in fields)
+
+class Subscription:
+    """One client's mailbox; pending quotes are merged so a slow reader only sees the latest of each"""
+    def __init__(self, tickers):
+        self.tickers = frozenset(tickers)
+        self._pending = {}
+        self._cond = threading.Condition()
+
+    def push(self, quotes):
+        with self._cond:
+            self._pending.update(quotes)
+            self._cond.notify()
+
+    def get(self, timeout=QUOTE_KEEPALIVE_SECONDS):
+        """Quotes that changed since the last call, or None if nothing changed within timeout"""
+        with self._cond:
+            if not self._pending:
+                self._cond.wait(timeout)
+            quotes, self._pending = self._pending, {}
+        return quotes or None
+
+class QuoteHub:
+    def __init__(self, fetch_batch=fetch_quotes, interval=QUOTE_REFRESH_SECONDS):
+        self.fetch_batch = fetch_batch
+        self.interval = interval
+        self._subs = set()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'refreshes': 0, 'errors': 0}
+
+    def subscribe(self, tickers):
+        sub = Subscription(tickers)
+        with self._lock:
+            self._subs.add(sub)
+            snapshot = {t: self._latest[t] for t in sub.tickers if t in self._latest}
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name='quote-hub')
+                self._thread.start()
+        # New subscribers get what is already known at once; unknown tickers trigger an early refresh
+        if snapshot:
+            sub.push(snapshot)
+        if len(snapshot) < len(sub.tickers):
+            self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subs.discard(sub)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                tickers = sorted(set().union(*(sub.tickers for sub in self._subs)))
+            if not tickers:
+                # Idle until someone subscribes
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            try:
+                quotes = self.fetch_batch(tickers)
+                self.stats['refreshes'] += 1
+            except Exception as e:
+                print(f"Quote refresh failed: {e}")
+                self.stats['errors'] += 1
+                quotes = {}
+
+            with self._lock:
+                changed = {t: q for t, q in quotes.items() if _changed(self._latest.get(t), q)}
+                self._latest.update(quotes)
+                # Forget tickers nobody watches any more
+                for t in set(self._latest) - set(tickers):
+                    del self._latest[t]
+                subs = list(self._subs)
+
+            for sub in subs:
+                delta = {t: changed[t] for t in sub.tickers if t in changed}
+                if delta:
+                    sub.push(delta)
+
+            self._wake.wait(self.interval)
+            self._wake.clear()
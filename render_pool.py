@@ -0,0 +1,105 @@
+"""
+Render Pool Module
+Process pool for CPU-bound chart rendering so concurrent renders aren't serialized on the GIL
+- Spawned workers pre-import matplotlib/mplfinance and warm the font cache once
+- A bounded number of renders may be queued; beyond that callers get RenderPoolBusy
+- Disabled (renders run in the calling thread) unless RENDER_WORKERS is set
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', '0'))
+RENDER_QUEUE = int(os.getenv('RENDER_QUEUE', str(RENDER_WORKERS * 2)))  # Renders allowed in flight (running + waiting)
+RENDER_SLOT_WAIT = 10  # Seconds a request waits for a slot before giving up
+RENDER_TIMEOUT = 120
+
+class RenderPoolBusy(Exception):
+    """Every render slot is taken; the caller should retry later"""
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(RENDER_QUEUE, RENDER_WORKERS, 1))
+
+def _warm_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot
+    from matplotlib import font_manager
+    import mplfinance
+    import generate_chart
+    # First findfont call builds/loads the font cache
+    font_manager.findfont(font_manager.FontProperties(family=matplotlib.rcParams['font.family']))
+
+def _ready():
+    return os.getpid()
+
+def enabled():
+    return RENDER_WORKERS > 0
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_worker
+            )
+        return _pool
+
+def configure(workers, queue=None):
+    """Override the worker count (e.g. from the batch CLI); only valid before the pool is created"""
+    global RENDER_WORKERS, RENDER_QUEUE, _slots
+    with _pool_lock:
+        if _pool is not None:
+            raise RuntimeError("Render pool is already running")
+        RENDER_WORKERS = workers
+        RENDER_QUEUE = queue if queue is not None else workers * 2
+        _slots = threading.BoundedSemaphore(max(RENDER_QUEUE, RENDER_WORKERS, 1))
+
+def start():
+    """Create the pool and spawn every worker up front so the first renders don't pay for imports"""
+    if not enabled():
+        return
+    pool = _get_pool()
+    for _ in range(RENDER_WORKERS):
+        pool.submit(_ready)
+    print(f"Render pool started with {RENDER_WORKERS} workers")
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+def render(fn, *args):
+    """Run fn(*args) in a worker process and return its result"""
+    if not _slots.acquire(timeout=RENDER_SLOT_WAIT):
+        raise RenderPoolBusy(f"All {RENDER_QUEUE} render slots are busy")
+    pool = _get_pool()
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        _slots.release()
+        print("Render pool broken, restarting it")
+        _reset_pool(pool)
+        return fn(*args)
+    except Exception:
+        _slots.release()
+        raise
+    # The slot is freed when the worker is done, not when this caller stops waiting,
+    # so a render that outlives RENDER_TIMEOUT still counts against the pool
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=RENDER_TIMEOUT)
+    except FuturesTimeout:
+        raise RenderPoolBusy(f"Render did not finish within {RENDER_TIMEOUT}s")
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); replace the pool and render this one in-process
+        print("Render pool broken, restarting it")
+        _reset_pool(pool)
+        return fn(*args)
@@ -0,0 +1,49 @@
+"""
+Single-Flight Module
+Coalesces concurrent identical calls so only one of them hits the upstream API.
+Callers that arrive while a call for the same key is in flight wait for it and share its result (or exception).
+"""
+
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) once per key among concurrent callers"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['calls'] += 1
+            else:
+                self.stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Later callers start a fresh fetch; only concurrent ones share this result
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -14,4 +14,5 @@ fi
 echo "Server running at http://127.0.0.1:5001"
 echo "Press Ctrl+C to stop"
 
-gunicorn -w 4 -b 127.0.0.1:5001 app:app --access-logfile - --error-logfile -
+# Threaded workers: long-lived requests such as /stream/quotes hold a thread, not a whole worker
+gunicorn -w 4 -k gthread --threads ${GUNICORN_THREADS:-16} -b 127.0.0.1:5001 app:app --access-logfile - --error-logfile -
@@ -1090,15 +1090,7 @@ chartForm.addEventListener('submit', async (e) => {
         downloadBtn.onclick = async () => {
             try {
                 const fileExt = (data.format === 'svg') ? 'svg' : 'png';
-                const res = await fetch('/download', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        image: data.image,
-                        ticker: formData.get('ticker'),
-                        format: data.format || 'png'
-                    })
-                });
+                const res = await fetch(data.url);
 
                 if (res.ok) {
                     const blob = await res.blob();
@@ -1690,11 +1682,15 @@ async function fetchNews(country) {
         </div>`;
 
     try {
-        const response = await fetch(`/api/news/${country}`);
+        const response = await fetch(`/api/news/${country}?trend_encoding=compact`);
         const data = await response.json();
 
         if (data.error) throw new Error(data.error);
 
+        if (data.summary && data.summary.macro_data) {
+            data.summary.macro_data.forEach(item => { item.trend = decodeTrend(item.trend); });
+        }
+
         allNewsData = data.news || [];
         summaryData = data.summary || null;
         hexagonData = data.hexagon || null;
@@ -1706,6 +1702,18 @@ async function fetchNews(country) {
     }
 }
 
+// Compact trends carry base64 little-endian int32 epoch days and float32 values
+function decodeTrend(trend) {
+    if (!trend || trend.encoding !== 'compact') return trend;
+    const toBuffer = (b64) => Uint8Array.from(atob(b64), c => c.charCodeAt(0)).buffer;
+    const days = new Int32Array(toBuffer(trend.days));
+    const values = new Float32Array(toBuffer(trend.values));
+    return {
+        dates: Array.from(days, d => new Date(d * 86400000).toISOString().slice(0, 10)),
+        values: Array.from(values)
+    };
+}
+
 function createNewsCard(item) {
     const sentimentClass = item.sentiment.toLowerCase();
     const impactDots = Array(5).fill(0).map((_, i) =>
@@ -2362,19 +2370,17 @@ function showMacroDetail(label, idx) {
         if (chartInstance) chartInstance.destroy();
 
         let slicePoints = fullValues.length;
-        const freq = data.frequency || 'daily';
-
-        // Calculate points based on frequency
-        // Daily: ~252/yr, Monthly: 12/yr, Quarterly: 4/yr
-        let pointsPerYear = 252;
-        if (freq === 'monthly') pointsPerYear = 12;
-        if (freq === 'quarterly') pointsPerYear = 4;
-
-        if (range === '1M') slicePoints = Math.max(2, Math.round(pointsPerYear / 12));
-        if (range === '3M') slicePoints = Math.max(2, Math.round(pointsPerYear / 4));
-        if (range === '1Y') slicePoints = pointsPerYear;
-        if (range === '5Y') slicePoints = pointsPerYear * 5;
-        if (range === 'MAX') slicePoints = fullValues.length;
+
+        // Slice by date: older history is downsampled server-side, so point counts aren't evenly spaced
+        const rangeMonths = { '1M': 1, '3M': 3, '1Y': 12, '5Y': 60 }[range];
+        if (rangeMonths && fullDates.length && !Array.isArray(trendObj)) {
+            const cutoff = new Date(fullDates[fullDates.length - 1]);
+            cutoff.setMonth(cutoff.getMonth() - rangeMonths);
+            const cutoffStr = cutoff.toISOString().slice(0, 10);
+            const firstInRange = fullDates.findIndex(d => d >= cutoffStr);
+            // Keep at least two points so sparse series still draw a line
+            slicePoints = Math.max(2, fullDates.length - (firstInRange === -1 ? 0 : firstInRange));
+        }
 
         // Ensure we don't slice more than we have
         if (slicePoints > fullValues.length) slicePoints = fullValues.length;
@@ -1,29 +1,87 @@
+import copy
+import hashlib
 import json
 import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows: journal appends and compaction run unlocked
+    fcntl = None
+
+class _StatCache:
+    """
+    Parsed contents of one or more files plus their serialized JSON and an ETag.
+    Reloaded only when a file's mtime, size or inode changes, so every gunicorn worker
+    notices writes made by the others without re-parsing on each request.
+    """
+    def __init__(self, paths, load):
+        self.paths = paths
+        self.load = load
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._entry = None
+
+    def _stat(self):
+        stamp = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def get(self):
+        """Returns (data, body bytes, etag); data is shared and must not be modified"""
+        stamp = self._stat()
+        with self._lock:
+            if stamp != self._stamp:
+                data = self.load()
+                body = json.dumps(data).encode('utf-8')
+                self._entry = (data, body, hashlib.sha1(body).hexdigest()[:20])
+                self._stamp = stamp
+            return self._entry
+
+    def invalidate(self):
+        with self._lock:
+            self._stamp = None
+
 class TemplateManager:
     def __init__(self, filepath='templates.json'):
         self.filepath = filepath
         self._ensure_file()
+        self._cache = _StatCache([filepath], self._read)
 
     def _ensure_file(self):
         if not os.path.exists(self.filepath):
             with open(self.filepath, 'w') as f:
                 json.dump({}, f)
 
-    def get_templates(self):
+    def _read(self):
         try:
             with open(self.filepath, 'r') as f:
                 return json.load(f)
         except Exception:
             return {}
 
+    def get_templates(self):
+        return copy.deepcopy(self._cache.get()[0])
+
+    def templates_json(self):
+        """(serialized templates, etag) from the read cache"""
+        return self._cache.get()[1:]
+
     def save_template(self, name, config):
         templates = self.get_templates()
         templates[name] = config
         with open(self.filepath, 'w') as f:
             json.dump(templates, f, indent=4)
+        self._cache.invalidate()
         return True
 
     def delete_template(self, name):
@@ -32,27 +90,43 @@ class TemplateManager:
             del templates[name]
             with open(self.filepath, 'w') as f:
                 json.dump(templates, f, indent=4)
+            self._cache.invalidate()
             return True
         return False
 
+def _offset_page(history, limit, cursor):
+    # Shared by the file-backed history managers, whose cursors are list offsets
+    offset = int(cursor) if cursor else 0
+    items = history[offset:offset + limit]
+    next_cursor = str(offset + limit) if offset + limit < len(history) else None
+    return items, next_cursor
+
 class HistoryManager:
     def __init__(self, filepath='history.json', max_items=50):
         self.filepath = filepath
         self.max_items = max_items
         self._ensure_file()
+        self._cache = _StatCache([filepath], self._read)
 
     def _ensure_file(self):
         if not os.path.exists(self.filepath):
             with open(self.filepath, 'w') as f:
                 json.dump([], f)
 
-    def get_history(self):
+    def _read(self):
         try:
             with open(self.filepath, 'r') as f:
                 return json.load(f)
         except Exception:
             return []
 
+    def get_history(self):
+        return copy.deepcopy(self._cache.get()[0])
+
+    def history_json(self):
+        """(serialized history, etag) from the read cache"""
+        return self._cache.get()[1:]
+
     def add_history(self, config):
         history = self.get_history()
         
@@ -74,6 +148,7 @@ class HistoryManager:
             
         with open(self.filepath, 'w') as f:
             json.dump(history, f, indent=4)
+        self._cache.invalidate()
         return summary
 
     def delete_history(self, index):
@@ -83,6 +158,7 @@ class HistoryManager:
             del history[index]
             with open(self.filepath, 'w') as f:
                 json.dump(history, f, indent=4)
+            self._cache.invalidate()
             return True
         return False
 
@@ -90,4 +166,352 @@ class HistoryManager:
         """Clear all history items"""
         with open(self.filepath, 'w') as f:
             json.dump([], f)
+        self._cache.invalidate()
+        return True
+
+    def get_history_page(self, limit=50, cursor=None):
+        """One page of history, newest first. The cursor is an offset; returns (items, next_cursor)."""
+        return _offset_page(self.get_history(), limit, cursor)
+
+class JournalHistoryManager:
+    """
+    History kept as an append-only JSON-lines journal (history.jsonl).
+    - add/delete/clear each append one record with a single O_APPEND write
+    - Reads replay the journal since its last clear record, applying adds, deletes and the max_items
+      bound in order; compaction keeps the journal short
+    - Once the journal grows past compact_bytes it is rewritten in a background thread; appenders
+      hold a shared flock and the compactor an exclusive one, so no append is lost to the rewrite
+    """
+    def __init__(self, filepath='history.jsonl', max_items=50, compact_bytes=256 * 1024, seed_path='history.json'):
+        self.filepath = filepath
+        self.lockpath = filepath + '.lock'
+        self.max_items = max_items
+        self.compact_bytes = compact_bytes
+        self._compacting = threading.Lock()
+        self._cache = _StatCache([filepath], self._read)
+        if not os.path.exists(self.filepath) and seed_path and os.path.exists(seed_path):
+            self._seed(seed_path)
+
+    @contextmanager
+    def _flock(self, exclusive):
+        with open(self.lockpath, 'a') as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _append(self, record):
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._flock(exclusive=False):
+            fd = os.open(self.filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        self._cache.invalidate()
+        if size > self.compact_bytes:
+            self.compact_async()
+
+    def _reverse_lines(self, block_size=64 * 1024):
+        """Journal lines from last to first, read in blocks from the end of the file"""
+        try:
+            f = open(self.filepath, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            tail = b''
+            while pos > 0:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                lines = (f.read(step) + tail).split(b'\n')
+                tail = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        yield line
+            if tail:
+                yield tail
+
+    def get_history(self):
+        return copy.deepcopy(self._cache.get()[0])
+
+    def history_json(self):
+        return self._cache.get()[1:]
+
+    def _read(self):
+        records = []
+        for line in self._reverse_lines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn write
+            if record.get('op') == 'clear':
+                break
+            records.append(record)
+        # Replay oldest first, trimming on every add as HistoryManager does, so an entry pushed past
+        # max_items stays gone even if a newer one is deleted afterwards
+        history = []
+        for record in reversed(records):
+            if record.get('op') == 'add':
+                history.insert(0, record['item'])
+                del history[self.max_items:]
+            elif record.get('op') == 'del':
+                history = [item for item in history if item.get('id') != record.get('id')]
+        return history
+
+    def get_history_page(self, limit=50, cursor=None):
+        """One page of history, newest first. The cursor is an offset; returns (items, next_cursor)."""
+        return _offset_page(self.get_history(), limit, cursor)
+
+    def add_history(self, config):
+        summary = {
+            "id": uuid.uuid4().hex,
+            "timestamp": datetime.now().isoformat(),
+            "ticker": config.get('ticker', 'Unknown'),
+            "period": config.get('period', '1y'),
+            "chart_type": config.get('chart_type', 'line'),
+            "config": config
+        }
+        self._append({'op': 'add', 'item': summary})
+        return summary
+
+    def delete_history(self, index):
+        """Delete a single history item by index (appends a tombstone)"""
+        history = self.get_history()
+        if 0 <= index < len(history):
+            self._append({'op': 'del', 'id': history[index]['id']})
+            return True
+        return False
+
+    def clear_all_history(self):
+        self._append({'op': 'clear'})
+        return True
+
+    def _seed(self, seed_path):
+        with self._flock(exclusive=True):
+            # Another worker may have seeded, or appended, since the unlocked check in __init__
+            if os.path.exists(self.filepath) and os.path.getsize(self.filepath) > 0:
+                return
+            self._rewrite(HistoryManager(seed_path).get_history())
+
+    def _rewrite(self, history):
+        # Caller holds the exclusive lock; history is newest first
+        tmp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for item in reversed(history):
+                item.setdefault('id', uuid.uuid4().hex)
+                f.write(json.dumps({'op': 'add', 'item': item}, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
+        self._cache.invalidate()
+
+    def compact(self):
+        """Rewrite the journal as just the live entries, enforcing max_items"""
+        with self._flock(exclusive=True):
+            if os.path.getsize(self.filepath) > self.compact_bytes:
+                self._rewrite(self._read())
+
+    def compact_async(self):
+        if not self._compacting.acquire(blocking=False):
+            return
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"History compaction failed: {e}")
+            finally:
+                self._compacting.release()
+        threading.Thread(target=run, daemon=True, name='history-compact').start()
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    name TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    updated TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    period TEXT,
+    chart_type TEXT,
+    config TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+CREATE INDEX IF NOT EXISTS history_ticker ON history (ticker);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class _SqliteStore:
+    """
+    SQLite (WAL) database shared by SqliteTemplateManager and SqliteHistoryManager.
+    Every change is a single-row statement or a short IMMEDIATE transaction, so concurrent
+    gunicorn workers serialize on the database instead of overwriting each other's JSON files.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self.connect().executescript(SQLITE_SCHEMA)
+
+    def connect(self):
+        # sqlite3 connections are per thread
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            db.row_factory = sqlite3.Row
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def transaction(self):
+        db = self.connect()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except Exception:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
+
+
+class SqliteTemplateManager:
+    def __init__(self, store):
+        self.store = store
+        # Commits show up as mtime/size changes of the database or its WAL file
+        self._cache = _StatCache([store.path, store.path + '-wal'], self._read)
+
+    def _read(self):
+        rows = self.store.connect().execute('SELECT name, config FROM templates ORDER BY rowid')
+        return {row['name']: json.loads(row['config']) for row in rows}
+
+    def get_templates(self):
+        return copy.deepcopy(self._cache.get()[0])
+
+    def templates_json(self):
+        return self._cache.get()[1:]
+
+    def save_template(self, name, config):
+        self.store.connect().execute(
+            'INSERT INTO templates (name, config, updated) VALUES (?, ?, ?) '
+            'ON CONFLICT(name) DO UPDATE SET config = excluded.config, updated = excluded.updated',
+            (name, json.dumps(config), datetime.now().isoformat()))
+        self._cache.invalidate()
+        return True
+
+    def delete_template(self, name):
+        cur = self.store.connect().execute('DELETE FROM templates WHERE name = ?', (name,))
+        self._cache.invalidate()
+        return cur.rowcount > 0
+
+class SqliteHistoryManager:
+    def __init__(self, store, max_items=50):
+        self.store = store
+        self.max_items = max_items
+        self._cache = _StatCache([store.path, store.path + '-wal'], self._read)
+
+    @staticmethod
+    def _row_to_item(row):
+        return {
+            "id": row['id'],
+            "timestamp": row['timestamp'],
+            "ticker": row['ticker'],
+            "period": row['period'],
+            "chart_type": row['chart_type'],
+            "config": json.loads(row['config'])
+        }
+
+    def _read(self):
+        rows = self.store.connect().execute('SELECT * FROM history ORDER BY id DESC LIMIT ?', (self.max_items,))
+        return [self._row_to_item(row) for row in rows]
+
+    def get_history(self):
+        return copy.deepcopy(self._cache.get()[0])
+
+    def history_json(self):
+        return self._cache.get()[1:]
+
+    def get_history_page(self, limit=50, cursor=None):
+        """One page of history, newest first. The cursor is the last id seen; returns (items, next_cursor)."""
+        db = self.store.connect()
+        if cursor:
+            rows = db.execute('SELECT * FROM history WHERE id < ? ORDER BY id DESC LIMIT ?', (int(cursor), limit + 1))
+        else:
+            rows = db.execute('SELECT * FROM history ORDER BY id DESC LIMIT ?', (limit + 1,))
+        items = [self._row_to_item(row) for row in rows]
+        next_cursor = str(items[limit - 1]['id']) if len(items) > limit else None
+        return items[:limit], next_cursor
+
+    def add_history(self, config):
+        summary = {
+            "timestamp": datetime.now().isoformat(),
+            "ticker": config.get('ticker', 'Unknown'),
+            "period": config.get('period', '1y'),
+            "chart_type": config.get('chart_type', 'line'),
+            "config": config
+        }
+        with self.store.transaction() as db:
+            cur = db.execute(
+                'INSERT INTO history (timestamp, ticker, period, chart_type, config) VALUES (?, ?, ?, ?, ?)',
+                (summary['timestamp'], summary['ticker'], summary['period'], summary['chart_type'], json.dumps(config)))
+            summary['id'] = cur.lastrowid
+            # Limit size
+            db.execute('DELETE FROM history WHERE id <= (SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)',
+                       (self.max_items,))
+        self._cache.invalidate()
+        return summary
+
+    def delete_history(self, index):
+        """Delete a single history item by its position, newest first"""
+        cur = self.store.connect().execute(
+            'DELETE FROM history WHERE id = (SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)', (index,))
+        self._cache.invalidate()
+        return cur.rowcount > 0
+
+    def clear_all_history(self):
+        self.store.connect().execute('DELETE FROM history')
+        self._cache.invalidate()
         return True
+
+def import_json_files(store, templates_path='templates.json', history_path='history.json'):
+    """Copy the JSON files into the database once; later calls (from any worker) are no-ops"""
+    with store.transaction() as db:
+        if db.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+            return False
+        if os.path.exists(templates_path):
+            templates = TemplateManager(templates_path).get_templates()
+            db.executemany('INSERT OR IGNORE INTO templates (name, config, updated) VALUES (?, ?, ?)',
+                           [(name, json.dumps(config), datetime.now().isoformat())
+                            for name, config in templates.items()])
+        if os.path.exists(history_path):
+            # history.json is newest first; insert oldest first so ids follow time
+            history = HistoryManager(history_path).get_history()
+            db.executemany(
+                'INSERT INTO history (timestamp, ticker, period, chart_type, config) VALUES (?, ?, ?, ?, ?)',
+                [(item.get('timestamp', ''), item.get('ticker', 'Unknown'), item.get('period'),
+                  item.get('chart_type'), json.dumps(item.get('config', {})))
+                 for item in reversed(history)])
+        db.execute("INSERT INTO meta (key, value) VALUES ('json_imported', ?)", (datetime.now().isoformat(),))
+        return True
+
+def create_managers():
+    """
+    Template and history managers for the configured backend.
+    STORAGE_BACKEND=sqlite stores both in STORAGE_DB (default macrocharts.db); STORAGE_BACKEND=journal
+    keeps history in an append-only history.jsonl; otherwise JSON files.
+    """
+    if os.getenv('STORAGE_BACKEND', 'json').lower() == 'sqlite':
+        store = _SqliteStore(os.getenv('STORAGE_DB', 'macrocharts.db'))
+        if import_json_files(store):
+            print("Imported templates.json and history.json into the SQLite store")
+        return SqliteTemplateManager(store), SqliteHistoryManager(store)
+    if os.getenv('STORAGE_BACKEND', 'json').lower() == 'journal':
+        return TemplateManager(), JournalHistoryManager()
+    return TemplateManager(), HistoryManager()